@@ -1,7 +1,19 @@
 from fastapi import APIRouter
 from app.api.v1.user_controller import router as user_router
 from app.api.v1.redis_controller import router as redis_router
+from app.api.v1.auth_controller import router as auth_router
+from app.api.v1.execution_controller import router as execution_router
+from app.api.v1.load_test_controller import router as load_test_router
+from app.api.v1.report_controller import router as report_router
+from app.api.v1.dataset_controller import router as dataset_router
+from app.api.v1.progress_controller import router as progress_router
 
 api_router = APIRouter(prefix="/api")
 api_router.include_router(user_router)
 api_router.include_router(redis_router)
+api_router.include_router(auth_router)
+api_router.include_router(execution_router)
+api_router.include_router(load_test_router)
+api_router.include_router(report_router)
+api_router.include_router(dataset_router)
+api_router.include_router(progress_router)
@@ -0,0 +1,22 @@
+from fastapi import APIRouter, Depends
+
+from app.core.logger import get_logger
+from app.models.domain.auth import LoginRequest, Token
+from app.models.domain.user import UserOut
+from app.services.auth_service import AuthService
+from app.utils.deps import get_auth_service, get_current_user
+
+router = APIRouter(prefix="/v1/auth", tags=["auth"])
+
+logger = get_logger(__name__)
+
+
+@router.post("/login", response_model=Token)
+async def login(payload: LoginRequest, service: AuthService = Depends(get_auth_service)):
+    token = await service.authenticate(payload.email, payload.password)
+    return Token(access_token=token)
+
+
+@router.get("/me", response_model=UserOut)
+async def me(current_user: UserOut = Depends(get_current_user)):
+    return current_user
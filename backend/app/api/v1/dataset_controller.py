@@ -0,0 +1,32 @@
+from fastapi import APIRouter, Depends, Query, Request, status
+
+from app.core.logger import get_logger
+from app.models.domain.dataset import DatasetOut
+from app.models.domain.user import UserOut
+from app.services.dataset import DatasetStore
+from app.utils.deps import get_current_user, get_dataset_store
+
+router = APIRouter(prefix="/v1/datasets", tags=["datasets"])
+
+logger = get_logger(__name__)
+
+
+@router.post("/", response_model=DatasetOut, status_code=status.HTTP_201_CREATED)
+async def upload_dataset(
+        request: Request,
+        name: str = Query(..., description="File name, e.g. users.csv or users.ndjson"),
+        store: DatasetStore = Depends(get_dataset_store),
+        current_user: UserOut = Depends(get_current_user),
+):
+    """
+    上传参数化数据集：请求体即文件内容（CSV 或 NDJSON），流式写入磁盘，不在内存中缓存
+    """
+    dataset = await store.save(name, request.stream())
+    logger.info("Dataset uploaded", dataset=dataset.id, rows=dataset.rows, size=dataset.size,
+                executor=current_user.name)
+    return dataset
+
+
+@router.get("/{dataset_id}", response_model=DatasetOut)
+async def get_dataset(dataset_id: str, store: DatasetStore = Depends(get_dataset_store)):
+    return await store.get(dataset_id)
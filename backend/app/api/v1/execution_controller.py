@@ -0,0 +1,44 @@
+from fastapi import APIRouter, Depends, status
+
+from app.core.logger import get_logger
+from app.models.domain.execution import ExecutionCreate, ExecutionOut
+from app.models.domain.user import UserOut
+from app.services.execution_service import ExecutionService
+from app.utils.deps import get_current_user, get_execution_service
+from app.workers.tasks import run_execution
+
+router = APIRouter(prefix="/v1/executions", tags=["executions"])
+
+logger = get_logger(__name__)
+
+
+@router.post("/", response_model=ExecutionOut, status_code=status.HTTP_202_ACCEPTED)
+async def create_execution(
+        payload: ExecutionCreate,
+        service: ExecutionService = Depends(get_execution_service),
+        current_user: UserOut = Depends(get_current_user),
+):
+    execution = await service.create_execution(payload, executor=current_user.name)
+    run_execution.delay(execution.id)
+    logger.info("Execution queued", execution_id=execution.id, scope=execution.scope)
+    return execution
+
+
+@router.get("/{execution_id}", response_model=ExecutionOut)
+async def get_execution(execution_id: int, service: ExecutionService = Depends(get_execution_service)):
+    return await service.get_execution(execution_id)
+
+
+@router.post("/{execution_id}/replay", response_model=ExecutionOut, status_code=status.HTTP_202_ACCEPTED)
+async def replay_failed_rows(
+        execution_id: int,
+        service: ExecutionService = Depends(get_execution_service),
+        current_user: UserOut = Depends(get_current_user),
+):
+    """
+    重新执行数据驱动执行中未通过的数据行（按行号）
+    """
+    execution = await service.replay_failures(execution_id, executor=current_user.name)
+    run_execution.delay(execution.id)
+    logger.info("Execution replay queued", execution_id=execution.id, replay_of=execution_id)
+    return execution
@@ -0,0 +1,30 @@
+from fastapi import APIRouter, Depends, status
+
+from app.core.logger import get_logger
+from app.models.domain.load_test import LoadTestCreate, LoadTestOut
+from app.models.domain.user import UserOut
+from app.services.load_test import LoadTestService
+from app.utils.deps import get_current_user, get_load_test_service
+from app.workers.tasks import dispatch_load_test
+
+router = APIRouter(prefix="/v1/load-tests", tags=["load-tests"])
+
+logger = get_logger(__name__)
+
+
+@router.post("/", response_model=LoadTestOut, status_code=status.HTTP_202_ACCEPTED)
+async def create_load_test(
+        payload: LoadTestCreate,
+        service: LoadTestService = Depends(get_load_test_service),
+        current_user: UserOut = Depends(get_current_user),
+):
+    load_test = await service.create(payload)
+    dispatch_load_test(load_test.id, payload)
+    logger.info("Load test queued", load_test_id=load_test.id, rate=payload.rate, workers=payload.workers,
+                executor=current_user.name)
+    return load_test
+
+
+@router.get("/{load_test_id}", response_model=LoadTestOut)
+async def get_load_test(load_test_id: str, service: LoadTestService = Depends(get_load_test_service)):
+    return await service.get(load_test_id)
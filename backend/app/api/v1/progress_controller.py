@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import asyncio
+from typing import Any, Dict, Iterable, Optional
+
+from fastapi import APIRouter, Query, WebSocket, WebSocketDisconnect, status
+
+from app.core.cache import get_redis_client
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.core.exception import UnauthorizedException
+from app.core.logger import get_logger
+from app.core.security import decode_access_token
+from app.models.domain.user import UserOut
+from app.repositories.execution_repo import ExecutionRepository
+from app.repositories.user_repo import UserRepository
+from app.services.auth_service import AuthService
+from app.services.progress_hub import Subscription, progress_hub
+
+router = APIRouter(prefix="/v1/ws", tags=["progress"])
+
+logger = get_logger(__name__)
+
+
+async def _authenticate(token: Optional[str]) -> UserOut:
+    claims = decode_access_token(token or "")
+    # Short-lived session: a WebSocket may stay open for hours and must not pin a pooled connection.
+    async with AsyncSessionLocal() as db:
+        return await AuthService(UserRepository(db), get_redis_client()).get_principal(claims["sub"])
+
+
+async def _stored_states(execution_ids: Iterable[int]) -> Dict[int, Dict[str, Any]]:
+    """Snapshot from MySQL for executions with no live or cached progress."""
+    states = {}
+    async with AsyncSessionLocal() as db:
+        repo = ExecutionRepository(db)
+        for execution_id in execution_ids:
+            execution = await repo.get(execution_id)
+            if execution is not None:
+                states[execution_id] = {
+                    "status": execution.status,
+                    "total": execution.total,
+                    "passed": execution.passed,
+                    "failed": execution.failed,
+                    "duration_ms": execution.duration_ms,
+                }
+    return states
+
+
+@router.websocket("/executions")
+async def execution_progress(websocket: WebSocket, token: Optional[str] = Query(default=None)):
+    """
+    实时执行进度：一个连接可订阅多个执行，每秒最多推送 PROGRESS_MAX_FPS 帧，每帧携带最新计数
+
+    客户端：{"action": "subscribe" | "unsubscribe", "executions": [1, 2]}
+    服务端：{"type": "snapshot" | "progress", "executions": {"1": {...}}}，出错时 {"type": "error", "message": ...}
+    """
+    try:
+        user = await _authenticate(token)
+    except UnauthorizedException:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    await websocket.accept()
+
+    send_lock = asyncio.Lock()
+
+    async def send(frame: Dict[str, Any]) -> None:
+        async with send_lock:
+            await websocket.send_json(frame)
+
+    subscription = Subscription(send)
+    sender = asyncio.create_task(subscription.run())
+    try:
+        while True:
+            try:
+                message = await websocket.receive_json()
+            except (KeyError, TypeError, ValueError):
+                message = None  # 非 JSON 文本帧或二进制帧，按格式错误处理
+            action = message.get("action") if isinstance(message, dict) else None
+            try:
+                execution_ids = [int(i) for i in message.get("executions", [])]
+            except (AttributeError, TypeError, ValueError):
+                execution_ids = None
+            if action not in ("subscribe", "unsubscribe") or execution_ids is None:
+                await send({"type": "error", "message": "Expected {\"action\": ..., \"executions\": [ids]}"})
+                continue
+
+            if action == "unsubscribe":
+                await progress_hub.unwatch(subscription, execution_ids)
+                continue
+            if len(subscription.executions | set(execution_ids)) > settings.PROGRESS_MAX_SUBSCRIPTIONS:
+                await send({"type": "error", "message": "Too many subscriptions on one connection"})
+                continue
+
+            snapshots = await progress_hub.watch(subscription, execution_ids)
+            missing = [i for i in execution_ids if i not in snapshots]
+            if missing:
+                snapshots.update(await _stored_states(missing))
+            await send({"type": "snapshot", "executions": snapshots})
+    except WebSocketDisconnect:
+        pass
+    finally:
+        sender.cancel()
+        await asyncio.gather(sender, return_exceptions=True)
+        await progress_hub.unwatch(subscription)
+        logger.info("Progress connection closed", user=user.email)
@@ -0,0 +1,16 @@
+from typing import Any, Dict
+
+from fastapi import APIRouter, Depends
+
+from app.services.report_service import ReportService
+from app.utils.deps import get_report_service
+
+router = APIRouter(prefix="/v1/reports", tags=["reports"])
+
+
+@router.get("/{execution_id}")
+async def get_report(execution_id: int, service: ReportService = Depends(get_report_service)) -> Dict[str, Any]:
+    """
+    执行报告汇总：按状态/模块/接口的计数与延迟分位数，大小与用例数量无关
+    """
+    return await service.get_report(execution_id)
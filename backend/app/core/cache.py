@@ -6,25 +6,38 @@ from __future__ import annotations
 import asyncio
 import json
 from contextlib import asynccontextmanager
-from typing import AsyncGenerator, Optional, AsyncIterator, Any
+from typing import AsyncGenerator, Optional, AsyncIterator, Any, Union
 from redis.asyncio import Redis
 from redis.asyncio.client import PubSub
 
 from app.core.config import settings
+from app.core.sharding import ShardedRedis, KeyT
 
 # -------- Global Client --------
 
-_redis_client: Optional[Redis] = None
+_redis_client: Optional[Union[Redis, ShardedRedis]] = None
 
 
 async def init_redis() -> None:
-    """Initialize shared Redis client during app lifespan."""
+    """Initialize shared Redis client during app lifespan.
+
+    When ``REDIS_SHARD_URLS`` is configured a :class:`ShardedRedis` is used
+    instead of a single client; both expose the same command surface.
+    """
     global _redis_client
     if _redis_client is None:
-        _redis_client = Redis.from_url(
-            settings.REDIS_URL,
-            decode_responses=False
-        )
+        if settings.REDIS_SHARD_URLS:
+            _redis_client = ShardedRedis.from_urls(
+                settings.REDIS_SHARD_URLS,
+                pubsub_url=settings.REDIS_PUBSUB_URL,
+                vnodes=settings.REDIS_SHARD_VNODES,
+                decode_responses=False,
+            )
+        else:
+            _redis_client = Redis.from_url(
+                settings.REDIS_URL,
+                decode_responses=False
+            )
 
 
 async def close_redis() -> None:
@@ -33,17 +46,27 @@ async def close_redis() -> None:
     if _redis_client is None:
         return
 
-    await _redis_client.close()
-    await _redis_client.connection_pool.disconnect()
+    if isinstance(_redis_client, ShardedRedis):
+        await _redis_client.close()
+    else:
+        await _redis_client.close()
+        await _redis_client.connection_pool.disconnect()
     _redis_client = None
 
 
-def get_redis_client() -> Redis:
+def get_redis_client() -> Union[Redis, ShardedRedis]:
     if _redis_client is None:
         raise RuntimeError("Redis not initialized. Call init_redis() in lifespan.")
     return _redis_client
 
 
+def node_for(redis: Union[Redis, ShardedRedis], key: KeyT) -> Redis:
+    """Return the concrete client that owns ``key`` (for pipelines and scripts)."""
+    if isinstance(redis, ShardedRedis):
+        return redis.get_node(key)
+    return redis
+
+
 # -------- FastAPI Dependency --------
 
 async def get_redis() -> AsyncGenerator[Redis, None]:
@@ -54,8 +54,56 @@ class Settings(BaseSettings):
     REDIS_DB: int = 0
     REDIS_PASSWORD: str | None = None
 
+    # 分片模式：配置多个 Redis 地址后按一致性哈希路由 key（为空则使用单实例）
+    REDIS_SHARD_URLS: List[str] = []
+    REDIS_PUBSUB_URL: Optional[str] = None  # 发布/订阅专用节点，默认使用第一个分片
+    REDIS_SHARD_VNODES: int = 160  # 每个分片在哈希环上的虚拟节点数
+
     DEFAULT_PAGE_SIZE: int = 100
 
+    # ========== 用例执行配置 ==========
+    EXECUTION_CONCURRENCY: int = 50  # 单次执行的最大并发用例数
+    EXECUTION_REQUEST_TIMEOUT: float = 30.0  # 单个请求超时时间（秒）
+    EXECUTION_MAX_CONNECTIONS: int = 100  # 每个环境的 HTTP 连接池上限
+    REPORT_FLUSH_INTERVAL: float = 0.5  # 报告聚合增量写入 Redis 的最长间隔（秒）
+    REPORT_FLUSH_EVERY: int = 200  # 累积多少条结果后立即写入 Redis
+    REPORT_TTL: int = 7 * 24 * 3600  # Redis 中报告聚合的保留时间（秒），结束后落库 MySQL
+    RESULT_BATCH_SIZE: int = 500  # 用例结果攒够多少条批量写入 MySQL
+    RESULT_BUFFER_MAX_BYTES: int = 64 * 1024 * 1024  # 内存中待写入结果的最大字节数（按落盘日志计），超出立即批量写入
+    RESULT_FLUSH_INTERVAL: float = 1.0  # 结果批量写入的最长间隔（秒）
+    RESULT_FLUSH_TIMEOUT: float = 5.0  # 单次批量写入超时，超时则保留在本地落盘文件中稍后重放
+    RESULT_SPOOL_DIR: str = "./spool/results"  # 结果预写日志目录（进程崩溃后可重放）
+    RESULT_BODY_COMPRESS_THRESHOLD: int = 1024  # 响应体超过该字节数时压缩存储
+    RESULT_BODY_MAX_BYTES: int = 16 * 1024 * 1024  # 响应体最多保存的字节数
+    DATASET_DIR: str = "./data/datasets"  # 参数化数据集（CSV/NDJSON）存放目录，API 与 Celery worker 必须共享（同一卷或网络存储）
+    DATASET_MAX_BYTES: int = 2 * 1024 * 1024 * 1024  # 单个数据集上传的大小上限
+    DATASET_CHUNK_ROWS: int = 1000  # 每次从数据集读取并投递给执行器的行数
+    PROGRESS_MAX_FPS: float = 4  # WebSocket 每个连接每秒最多推送的进度帧数（合并为最新计数）
+    PROGRESS_MAX_SUBSCRIPTIONS: int = 200  # 单个 WebSocket 连接最多同时订阅的执行数
+    PROGRESS_SNAPSHOT_INTERVAL: float = 0.5  # 执行进度快照写入 Redis 的最短间隔（秒），供晚到的订阅者恢复
+    PROGRESS_SNAPSHOT_TTL: int = 24 * 3600  # 进度快照在 Redis 中的保留时间（秒）
+    OUTBOUND_RATE_LIMIT: float = 0  # 每个 环境+主机 的默认出站请求速率（次/秒，所有 worker 共享），0 表示不限
+    OUTBOUND_BURST: int = 0  # 令牌桶容量，0 表示等于速率（至少 1）
+    OUTBOUND_MAX_WAIT: float = 10.0  # 等待令牌的最长时间（秒），超出则该请求直接失败
+    OUTBOUND_BREAKER_WINDOW: int = 50  # 熔断器统计最近多少个请求
+    OUTBOUND_BREAKER_MIN_REQUESTS: int = 20  # 窗口内至少多少个请求才判断错误率
+    OUTBOUND_BREAKER_ERROR_RATE: float = 0.5  # 错误率（连接错误/超时/5xx）达到该值时熔断
+    OUTBOUND_BREAKER_COOLDOWN: float = 10.0  # 熔断后快速失败的时长（秒），之后放行单个探测请求
+    OUTBOUND_BREAKER_SYNC_INTERVAL: float = 1.0  # 检查其他进程熔断状态的间隔（秒）
+    OUTBOUND_MIN_CONCURRENCY: int = 2  # 自适应并发的下限
+    OUTBOUND_LATENCY_TOLERANCE: float = 2.0  # 延迟超过基线的倍数时收缩并发
+    LOAD_TEST_MAX_IN_FLIGHT: int = 2000  # 压测单个 worker 允许的最大未完成请求数，超出的到达记为丢弃
+    LOAD_TEST_RESULT_TTL: int = 7 * 24 * 3600  # 压测结果在 Redis 中的保留时间（秒）
+    EXPRESSION_CACHE_SIZE: int = 4096  # 已编译 JSONPath/正则表达式的 LRU 容量
+    STREAMING_JSON_THRESHOLD: int = 1024 * 1024  # 响应体超过该字节数时按路径定向提取，不整体解析
+
+    # ========== 认证配置 ==========
+    JWT_SECRET: str = "change-me-in-production"
+    JWT_ALGORITHM: str = "HS256"
+    ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24
+    AUTH_TOKEN_CACHE_SIZE: int = 10000  # 已验签 token 的本地 LRU 容量
+    AUTH_PRINCIPAL_CACHE_TTL: int = 300  # 用户信息在 Redis 中的缓存时间（秒）
+
     @property
     def REDIS_URL(self) -> str:
         return f"redis://{self.REDIS_HOST}:{self.REDIS_PORT}/{self.REDIS_DB}"
@@ -1,7 +1,14 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
 from passlib.context import CryptContext
-from jose import jwt
+from jose import jwt, JWTError
 from datetime import datetime, timedelta
 from app.core.config import settings
+from app.core.exception import UnauthorizedException
 
 pwd_context = CryptContext(
     schemes=["argon2"],
@@ -21,3 +28,74 @@ def create_access_token(subject: str, expires_delta: int = None):
     expire = datetime.utcnow() + timedelta(minutes=expires_delta or settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     to_encode = {"exp": expire, "sub": str(subject)}
     return jwt.encode(to_encode, settings.JWT_SECRET, algorithm=settings.JWT_ALGORITHM)
+
+
+# -------- Verified Token Cache --------
+
+class TokenCache:
+    """Bounded LRU of verified token claims, keyed by the SHA-256 of the token.
+
+    Entries are only served while their ``exp`` claim is in the future, so a
+    cached token expires exactly when the signed one would.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._data: OrderedDict[bytes, dict] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode("utf-8")).digest()
+
+    def get(self, token: str) -> Optional[dict]:
+        key = self._key(token)
+        with self._lock:
+            claims = self._data.get(key)
+            if claims is None:
+                return None
+            if claims["exp"] <= time.time():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return claims
+
+    def put(self, token: str, claims: dict) -> None:
+        if self.maxsize <= 0:
+            return
+        key = self._key(token)
+        with self._lock:
+            self._data[key] = claims
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+token_cache = TokenCache(settings.AUTH_TOKEN_CACHE_SIZE)
+
+
+def decode_access_token(token: str) -> dict:
+    """Verify a token and return its claims, skipping crypto for cached tokens."""
+    claims = token_cache.get(token)
+    if claims is not None:
+        return claims
+
+    try:
+        claims = jwt.decode(
+            token,
+            settings.JWT_SECRET,
+            algorithms=[settings.JWT_ALGORITHM],
+            options={"require_exp": True, "require_sub": True},
+        )
+    except JWTError:
+        raise UnauthorizedException("Invalid or expired token")
+
+    token_cache.put(token, claims)
+    return claims
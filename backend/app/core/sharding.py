@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from __future__ import annotations
+
+import asyncio
+import bisect
+import hashlib
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from redis.asyncio import Redis
+from redis.asyncio.client import PubSub
+
+KeyT = Union[str, bytes]
+
+# Commands whose first argument is the (only) key; they are routed to the
+# shard owning that key and otherwise behave exactly like ``redis.asyncio.Redis``.
+SINGLE_KEY_COMMANDS = frozenset({
+    "get", "set", "setex", "setnx", "getdel", "getset", "append",
+    "incr", "incrby", "incrbyfloat", "decr", "decrby",
+    "expire", "pexpire", "expireat", "ttl", "pttl", "persist", "type",
+    "hget", "hset", "hsetnx", "hmget", "hgetall", "hdel", "hexists", "hlen",
+    "hkeys", "hvals", "hincrby", "hincrbyfloat",
+    "lpush", "rpush", "lpop", "rpop", "lrange", "ltrim", "llen",
+    "sadd", "srem", "smembers", "sismember", "scard",
+    "zadd", "zrem", "zincrby", "zrange", "zrangebyscore", "zscore", "zcard",
+    "xadd", "xrange", "xlen", "xtrim",
+})
+
+
+def _to_bytes(value: KeyT) -> bytes:
+    return value if isinstance(value, bytes) else str(value).encode("utf-8")
+
+
+def hash_tag(key: KeyT) -> bytes:
+    """Return the part of ``key`` used for routing.
+
+    Follows the Redis Cluster convention: if the key contains ``{tag}``
+    with a non-empty tag, only the tag is hashed, so related keys such as
+    ``report:{42}:counts`` and ``report:{42}:latency`` land on one shard.
+    """
+    raw = _to_bytes(key)
+    start = raw.find(b"{")
+    if start != -1:
+        end = raw.find(b"}", start + 1)
+        if end > start + 1:
+            return raw[start + 1:end]
+    return raw
+
+
+class HashRing:
+    """Consistent hash ring with virtual nodes.
+
+    Adding or removing a node only remaps the keys that fall on the arcs
+    it gains or loses, i.e. roughly ``1 / len(nodes)`` of the key space.
+    """
+
+    def __init__(self, nodes: Iterable[str] = (), vnodes: int = 160):
+        self.vnodes = vnodes
+        self._points: List[int] = []
+        self._owners: List[str] = []
+        self._nodes: List[str] = []
+        for node in nodes:
+            self.add_node(node)
+
+    @staticmethod
+    def _hash(value: bytes) -> int:
+        return int.from_bytes(hashlib.md5(value).digest()[:8], "big")
+
+    @property
+    def nodes(self) -> List[str]:
+        return list(self._nodes)
+
+    def add_node(self, node: str) -> None:
+        if node in self._nodes:
+            return
+        self._nodes.append(node)
+        for i in range(self.vnodes):
+            point = self._hash(f"{node}#{i}".encode("utf-8"))
+            idx = bisect.bisect(self._points, point)
+            self._points.insert(idx, point)
+            self._owners.insert(idx, node)
+
+    def remove_node(self, node: str) -> None:
+        if node not in self._nodes:
+            return
+        self._nodes.remove(node)
+        kept = [(p, o) for p, o in zip(self._points, self._owners) if o != node]
+        self._points = [p for p, _ in kept]
+        self._owners = [o for _, o in kept]
+
+    def get_node(self, key: KeyT) -> str:
+        if not self._points:
+            raise RuntimeError("Hash ring has no nodes")
+        idx = bisect.bisect(self._points, self._hash(hash_tag(key)))
+        if idx == len(self._points):
+            idx = 0
+        return self._owners[idx]
+
+
+class ShardedRedis:
+    """Client-side sharded facade over several ``Redis`` clients.
+
+    Single-key commands are routed by consistent hashing; multi-key
+    commands are split per shard and executed concurrently. Pub/sub goes
+    to a dedicated node so subscribers and publishers always meet.
+    """
+
+    def __init__(
+            self,
+            nodes: Dict[str, Redis],
+            pubsub_node: Optional[Redis] = None,
+            vnodes: int = 160,
+    ):
+        if not nodes:
+            raise ValueError("ShardedRedis needs at least one node")
+        self.nodes = dict(nodes)
+        self.ring = HashRing(self.nodes, vnodes=vnodes)
+        self._owns_pubsub = pubsub_node is not None
+        self.pubsub_node = pubsub_node or next(iter(self.nodes.values()))
+
+    @classmethod
+    def from_urls(
+            cls,
+            urls: Iterable[str],
+            pubsub_url: Optional[str] = None,
+            vnodes: int = 160,
+            **kwargs: Any,
+    ) -> "ShardedRedis":
+        nodes = {url: Redis.from_url(url, **kwargs) for url in urls}
+        pubsub_node = Redis.from_url(pubsub_url, **kwargs) if pubsub_url else None
+        return cls(nodes, pubsub_node=pubsub_node, vnodes=vnodes)
+
+    # -------- Routing --------
+
+    def get_node(self, key: KeyT) -> Redis:
+        return self.nodes[self.ring.get_node(key)]
+
+    def _group(self, keys: Iterable[KeyT]) -> Dict[str, List[Tuple[int, KeyT]]]:
+        groups: Dict[str, List[Tuple[int, KeyT]]] = defaultdict(list)
+        for pos, key in enumerate(keys):
+            groups[self.ring.get_node(key)].append((pos, key))
+        return groups
+
+    def __getattr__(self, name: str):
+        if name not in SINGLE_KEY_COMMANDS:
+            raise AttributeError(f"{type(self).__name__} does not support {name!r}")
+
+        def command(key: KeyT, *args: Any, **kwargs: Any):
+            return getattr(self.get_node(key), name)(key, *args, **kwargs)
+
+        return command
+
+    def pipeline(self, key: KeyT, transaction: bool = True):
+        """Pipeline on the shard owning ``key`` (use hash tags to co-locate keys)."""
+        return self.get_node(key).pipeline(transaction=transaction)
+
+    # -------- Multi-key Commands --------
+
+    async def mget(self, keys: Union[KeyT, Iterable[KeyT]], *args: KeyT) -> List[Any]:
+        keys = [keys, *args] if isinstance(keys, (str, bytes)) else [*keys, *args]
+        groups = self._group(keys)
+        replies = await asyncio.gather(*(
+            self.nodes[node].mget([k for _, k in items]) for node, items in groups.items()
+        ))
+        values: List[Any] = [None] * len(keys)
+        for items, reply in zip(groups.values(), replies):
+            for (pos, _), value in zip(items, reply):
+                values[pos] = value
+        return values
+
+    async def mset(self, mapping: Dict[KeyT, Any]) -> bool:
+        groups = self._group(mapping)
+        await asyncio.gather(*(
+            self.nodes[node].mset({k: mapping[k] for _, k in items}) for node, items in groups.items()
+        ))
+        return True
+
+    async def _sum_per_shard(self, command: str, keys: Iterable[KeyT]) -> int:
+        groups = self._group(keys)
+        replies = await asyncio.gather(*(
+            getattr(self.nodes[node], command)(*[k for _, k in items]) for node, items in groups.items()
+        ))
+        return sum(replies)
+
+    async def delete(self, *keys: KeyT) -> int:
+        return await self._sum_per_shard("delete", keys)
+
+    async def unlink(self, *keys: KeyT) -> int:
+        return await self._sum_per_shard("unlink", keys)
+
+    async def exists(self, *keys: KeyT) -> int:
+        return await self._sum_per_shard("exists", keys)
+
+    # -------- Pub/Sub --------
+
+    async def publish(self, channel: KeyT, message: Any) -> int:
+        return await self.pubsub_node.publish(channel, message)
+
+    def pubsub(self, **kwargs: Any) -> PubSub:
+        return self.pubsub_node.pubsub(**kwargs)
+
+    # -------- Lifecycle --------
+
+    async def ping(self) -> bool:
+        clients = [*self.nodes.values()] + ([self.pubsub_node] if self._owns_pubsub else [])
+        return all(await asyncio.gather(*(c.ping() for c in clients)))
+
+    async def close(self) -> None:
+        clients = [*self.nodes.values()] + ([self.pubsub_node] if self._owns_pubsub else [])
+        for client in clients:
+            await client.aclose()
+            await client.connection_pool.disconnect()
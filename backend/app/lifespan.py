@@ -6,6 +6,7 @@ from contextlib import asynccontextmanager
 from app.core.cache import init_redis, close_redis
 from app.core.database import init_db, close_db
 from app.events.consumers.consumer import event_listener
+from app.services.progress_hub import progress_hub
 
 
 @asynccontextmanager
@@ -19,6 +20,7 @@ async def app_lifespan(app: FastAPI):
     yield
 
     # ----------- shutdown -----------
+    await progress_hub.close()
     await close_db()
     await close_redis()
     task.cancel()
@@ -0,0 +1,11 @@
+from typing import List, Literal
+
+from pydantic import BaseModel
+
+
+class DatasetOut(BaseModel):
+    id: str
+    format: Literal["csv", "ndjson"]
+    size: int
+    rows: int
+    columns: List[str] = []
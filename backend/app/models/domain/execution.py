@@ -0,0 +1,94 @@
+from datetime import datetime
+from typing import Any, Dict, List, Literal, Optional
+
+from pydantic import BaseModel, Field
+
+
+class KeyValue(BaseModel):
+    key: str
+    value: str = ""
+
+
+class Extractor(BaseModel):
+    variable: str
+    source: Literal["response_header", "response_body"] = "response_body"
+    extract_type: Literal["jsonpath", "regex"] = "jsonpath"
+    expression: str
+
+
+class BodyAssertion(BaseModel):
+    jsonpath: str
+    operator: Literal["equals", "contains", "greater", "less"]
+    expected: str
+
+
+class Assertions(BaseModel):
+    status_code: Optional[str] = Field(default=None, alias="statusCode")
+    body: List[BodyAssertion] = []
+
+    model_config = dict(populate_by_name=True)
+
+
+class CaseOut(BaseModel):
+    id: int
+    name: str
+    module: str = ""
+    method: str
+    path: str
+    headers: List[KeyValue] = []
+    params: List[KeyValue] = []
+    body_type: Literal["json", "form"] = "json"
+    body: Optional[str] = None
+    form_data: List[KeyValue] = []
+    assertions: Assertions = Assertions()
+    extractors: List[Extractor] = []
+
+    model_config = dict(from_attributes=True)
+
+
+class OutboundPolicy(BaseModel):
+    rate: Optional[float] = Field(default=None, ge=0, description="Requests per second per host, 0 = unlimited")
+    burst: Optional[int] = Field(default=None, ge=0)
+    max_concurrency: Optional[int] = Field(default=None, ge=1)
+
+
+class EnvironmentOut(BaseModel):
+    id: int
+    name: str
+    base_url: str
+    headers: List[KeyValue] = []
+    variables: Dict[str, Any] = {}
+    outbound: Optional[OutboundPolicy] = None
+
+    model_config = dict(from_attributes=True)
+
+
+class ExecutionCreate(BaseModel):
+    name: str
+    scope: Literal["single", "module", "all"]
+    case_id: Optional[int] = None
+    module: Optional[str] = None
+    environment: int
+    parameters: Dict[str, Any] = {}
+    dataset: Optional[str] = Field(default=None, description="Dataset id; runs the case once per row")
+    rows: Optional[List[int]] = Field(default=None, description="Only run these dataset row indexes")
+
+
+class ExecutionOut(BaseModel):
+    id: int
+    name: str
+    scope: str
+    case_id: Optional[int] = None
+    module: Optional[str] = None
+    environment_id: int
+    dataset: Optional[str] = None
+    executor: Optional[str] = None
+    status: str
+    total: int
+    passed: int
+    failed: int
+    duration_ms: Optional[float] = None
+    created_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    model_config = dict(from_attributes=True)
@@ -0,0 +1,21 @@
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel, Field
+
+
+class LoadTestCreate(BaseModel):
+    case_ids: List[int] = Field(min_length=1)
+    environment: int
+    rate: float = Field(gt=0, description="Target arrivals per second across all workers")
+    duration: float = Field(gt=0, description="Seconds of load, including ramp-up")
+    ramp_up: float = Field(default=0, ge=0, description="Seconds to ramp linearly from 0 to rate")
+    workers: int = Field(default=1, ge=1, le=256)
+    parameters: Dict[str, Any] = {}
+
+
+class LoadTestOut(BaseModel):
+    id: str
+    status: str
+    config: LoadTestCreate
+    result: Dict[str, Any] = {}
+    error: Optional[str] = None
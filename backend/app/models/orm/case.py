@@ -0,0 +1,18 @@
+from sqlalchemy import Column, Integer, String, Text, JSON
+from app.core.database import Base
+
+
+class ApiCase(Base):
+    __tablename__ = "api_cases"
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    name = Column(String(255), nullable=False)
+    module = Column(String(255), nullable=False, default="", index=True)
+    method = Column(String(16), nullable=False)
+    path = Column(String(1024), nullable=False)
+    headers = Column(JSON, nullable=False, default=list)
+    params = Column(JSON, nullable=False, default=list)
+    body_type = Column(String(16), nullable=False, default="json")
+    body = Column(Text, nullable=True)
+    form_data = Column(JSON, nullable=False, default=list)
+    assertions = Column(JSON, nullable=False, default=dict)
+    extractors = Column(JSON, nullable=False, default=list)
@@ -0,0 +1,12 @@
+from sqlalchemy import Column, Integer, String, JSON
+from app.core.database import Base
+
+
+class Environment(Base):
+    __tablename__ = "environments"
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    name = Column(String(255), nullable=False)
+    base_url = Column(String(1024), nullable=False)
+    headers = Column(JSON, nullable=False, default=list)
+    variables = Column(JSON, nullable=False, default=dict)
+    outbound = Column(JSON, nullable=True)  # OutboundPolicy overrides: rate, burst, max_concurrency
@@ -0,0 +1,23 @@
+from sqlalchemy import Column, Integer, String, Float, DateTime, JSON, func
+from app.core.database import Base
+
+
+class Execution(Base):
+    __tablename__ = "executions"
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    name = Column(String(255), nullable=False)
+    scope = Column(String(16), nullable=False)
+    case_id = Column(Integer, nullable=True)
+    module = Column(String(255), nullable=True)
+    environment_id = Column(Integer, nullable=False, index=True)
+    parameters = Column(JSON, nullable=False, default=dict)
+    dataset = Column(String(255), nullable=True)
+    dataset_rows = Column(JSON, nullable=True)
+    executor = Column(String(255), nullable=True)
+    status = Column(String(16), nullable=False, default="pending", index=True)
+    total = Column(Integer, nullable=False, default=0)
+    passed = Column(Integer, nullable=False, default=0)
+    failed = Column(Integer, nullable=False, default=0)
+    duration_ms = Column(Float, nullable=True)
+    created_at = Column(DateTime, nullable=False, server_default=func.now())
+    finished_at = Column(DateTime, nullable=True)
@@ -0,0 +1,32 @@
+from sqlalchemy import Column, Integer, String, Float, Text, Boolean, JSON, LargeBinary
+from sqlalchemy.dialects.mysql import LONGBLOB
+from app.core.database import Base
+
+
+class ExecutionResult(Base):
+    """Hot summary row per case result; kept narrow so reports and lists stay fast."""
+    __tablename__ = "execution_results"
+    execution_id = Column(Integer, primary_key=True, autoincrement=False)
+    seq = Column(Integer, primary_key=True, autoincrement=False)
+    case_id = Column(Integer, nullable=False, index=True)
+    name = Column(String(255), nullable=False)
+    module = Column(String(255), nullable=False, default="")
+    endpoint = Column(String(1024), nullable=False, default="")
+    status = Column(String(16), nullable=False, index=True)
+    status_code = Column(Integer, nullable=True)
+    duration_ms = Column(Float, nullable=False, default=0)
+    error = Column(Text, nullable=True)
+
+
+class ExecutionResultDetail(Base):
+    """Cold detail row: assertions, headers and the (possibly compressed) response body."""
+    __tablename__ = "execution_result_details"
+    execution_id = Column(Integer, primary_key=True, autoincrement=False)
+    seq = Column(Integer, primary_key=True, autoincrement=False)
+    url = Column(Text, nullable=True)
+    response_headers = Column(JSON, nullable=True)
+    assertions = Column(JSON, nullable=True)
+    extracted = Column(JSON, nullable=True)
+    body = Column(LargeBinary().with_variant(LONGBLOB, "mysql"), nullable=True)
+    body_compressed = Column(Boolean, nullable=False, default=False)
+    body_size = Column(Integer, nullable=False, default=0)
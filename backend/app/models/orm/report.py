@@ -0,0 +1,9 @@
+from sqlalchemy import Column, Integer, DateTime, JSON, func
+from app.core.database import Base
+
+
+class ExecutionReport(Base):
+    __tablename__ = "execution_reports"
+    execution_id = Column(Integer, primary_key=True, autoincrement=False)
+    summary = Column(JSON, nullable=False)
+    updated_at = Column(DateTime, nullable=False, server_default=func.now(), onupdate=func.now())
@@ -0,0 +1,26 @@
+from typing import Iterable, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.orm.case import ApiCase
+
+
+class CaseRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get(self, case_id: int) -> Optional[ApiCase]:
+        return await self.db.get(ApiCase, case_id)
+
+    async def list_by_module(self, module: str):
+        result = await self.db.execute(select(ApiCase).where(ApiCase.module == module).order_by(ApiCase.id))
+        return result.scalars().all()
+
+    async def list_by_ids(self, case_ids: Iterable[int]):
+        result = await self.db.execute(select(ApiCase).where(ApiCase.id.in_(list(case_ids))).order_by(ApiCase.id))
+        return result.scalars().all()
+
+    async def list_all(self):
+        result = await self.db.execute(select(ApiCase).order_by(ApiCase.id))
+        return result.scalars().all()
@@ -0,0 +1,13 @@
+from typing import Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.orm.environment import Environment
+
+
+class EnvironmentRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get(self, environment_id: int) -> Optional[Environment]:
+        return await self.db.get(Environment, environment_id)
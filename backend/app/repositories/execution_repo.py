@@ -0,0 +1,47 @@
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.orm.execution import Execution
+from app.models.domain.execution import ExecutionCreate
+
+
+class ExecutionRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def create(self, data: ExecutionCreate, executor: Optional[str] = None) -> Execution:
+        execution = Execution(
+            name=data.name,
+            scope=data.scope,
+            case_id=data.case_id,
+            module=data.module,
+            environment_id=data.environment,
+            parameters=data.parameters,
+            dataset=data.dataset,
+            dataset_rows=data.rows,
+            executor=executor,
+            status="pending",
+        )
+        self.db.add(execution)
+        await self.db.commit()
+        await self.db.refresh(execution)
+        return execution
+
+    async def get(self, execution_id: int) -> Optional[Execution]:
+        return await self.db.get(Execution, execution_id)
+
+    async def mark_running(self, execution: Execution, total: int) -> None:
+        execution.status = "running"
+        execution.total = total
+        await self.db.commit()
+
+    async def mark_finished(self, execution: Execution, status: str, passed: int, failed: int,
+                            duration_ms: float) -> None:
+        execution.status = status
+        execution.passed = passed
+        execution.failed = failed
+        execution.duration_ms = duration_ms
+        execution.finished_at = datetime.now()
+        await self.db.commit()
@@ -0,0 +1,18 @@
+from typing import Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.orm.report import ExecutionReport
+
+
+class ReportRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get(self, execution_id: int) -> Optional[ExecutionReport]:
+        return await self.db.get(ExecutionReport, execution_id)
+
+    async def save(self, execution_id: int, summary: dict) -> ExecutionReport:
+        report = await self.db.merge(ExecutionReport(execution_id=execution_id, summary=summary))
+        await self.db.commit()
+        return report
@@ -0,0 +1,37 @@
+from typing import List
+
+from sqlalchemy import select
+from sqlalchemy.dialects.mysql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.orm.execution_result import ExecutionResult, ExecutionResultDetail
+
+
+def _insert_new(model):
+    return insert(model).on_duplicate_key_update(seq=model.__table__.c.seq)
+
+
+class ResultRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def insert_many(self, summaries: List[dict], details: List[dict]) -> None:
+        """Multi-row insert of both tables in one transaction.
+
+        A no-op ``ON DUPLICATE KEY UPDATE`` makes replaying an already-committed
+        batch a no-op, while data errors still fail the batch; ``INSERT IGNORE``
+        would demote them to warnings and store truncated values.
+        """
+        if summaries:
+            await self.db.execute(_insert_new(ExecutionResult), summaries)
+        if details:
+            await self.db.execute(_insert_new(ExecutionResultDetail), details)
+        await self.db.commit()
+
+    async def failed_seqs(self, execution_id: int) -> List[int]:
+        stmt = (
+            select(ExecutionResult.seq)
+            .where(ExecutionResult.execution_id == execution_id, ExecutionResult.status != "success")
+            .order_by(ExecutionResult.seq)
+        )
+        return list((await self.db.scalars(stmt)).all())
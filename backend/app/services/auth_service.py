@@ -0,0 +1,64 @@
+from typing import Optional
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from app.core.cache import get_json, set_json
+from app.core.config import settings
+from app.core.exception import UnauthorizedException
+from app.core.logger import get_logger
+from app.core.security import create_access_token, verify_password
+from app.models.domain.user import UserOut
+from app.repositories.user_repo import UserRepository
+
+PRINCIPAL_KEY = "auth:principal:{}"
+
+logger = get_logger(__name__)
+
+
+async def invalidate_principal(redis: Optional[Redis], email: str) -> None:
+    """Drop the cached principal so the next request reloads it from MySQL.
+
+    Best effort: the user change has already been committed, and a stale
+    entry expires after ``AUTH_PRINCIPAL_CACHE_TTL`` anyway.
+    """
+    if redis is None:
+        return
+    try:
+        await redis.delete(PRINCIPAL_KEY.format(email))
+    except RedisError as exc:
+        logger.warning("Principal invalidation failed", email=email, error=str(exc))
+
+
+class AuthService:
+    def __init__(self, repo: UserRepository, redis: Redis):
+        self.repo = repo
+        self.redis = redis
+
+    async def authenticate(self, email: str, password: str) -> str:
+        user = await self.repo.get_by_email(email)
+        if not user or not user.hashed_password or not verify_password(password, user.hashed_password):
+            raise UnauthorizedException("Incorrect email or password")
+        return create_access_token(user.email)
+
+    async def get_principal(self, subject: str) -> UserOut:
+        key = PRINCIPAL_KEY.format(subject)
+        try:
+            cached = await get_json(self.redis, key)
+        except RedisError as exc:
+            # The cache only saves a query; an outage must not fail every request.
+            logger.warning("Principal cache unavailable", error=str(exc))
+            cached = None
+        if cached is not None:
+            return UserOut(**cached)
+
+        user = await self.repo.get_by_email(subject)
+        if not user:
+            raise UnauthorizedException("User no longer exists")
+
+        principal = UserOut.model_validate(user)
+        try:
+            await set_json(self.redis, key, principal.model_dump(), ex=settings.AUTH_PRINCIPAL_CACHE_TTL)
+        except RedisError as exc:
+            logger.warning("Principal cache unavailable", error=str(exc))
+        return principal
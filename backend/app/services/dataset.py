@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Parameter datasets for data-driven executions.
+
+A dataset is a CSV file (header row, then one parameter set per row) or an
+NDJSON file (one JSON object per line) under ``DATASET_DIR``. Uploads land
+in the API process and runs read them in a Celery worker, so ``DATASET_DIR``
+must be storage both see (a shared volume or network mount). A dataset is
+never loaded whole: NDJSON is scanned through ``mmap`` line by line, CSV
+through the streaming ``csv`` reader, and rows reach the engine in chunks
+of ``DATASET_CHUNK_ROWS``.
+
+Row ``i`` is the ``i``-th non-blank data row (0-based, CSV header
+excluded). It becomes the result's ``seq``, so failed rows can be re-run
+by index.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import csv
+import itertools
+import json
+import mmap
+import os
+import re
+import uuid
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, AsyncIterator, Collection, Dict, Iterator, List, Optional
+
+from app.core.config import settings
+from app.core.exception import BusinessException, NotFoundException
+from app.models.domain.dataset import DatasetOut
+
+DATASET_ID = re.compile(r"^[A-Za-z0-9][A-Za-z0-9_-]*\.(csv|ndjson|jsonl)$")
+FORMATS = {"csv": "csv", "ndjson": "ndjson", "jsonl": "ndjson"}
+
+
+@dataclass
+class DatasetRow:
+    index: int
+    values: Dict[str, Any] = field(default_factory=dict)
+    error: Optional[str] = None
+
+
+def dataset_format(name: str) -> str:
+    fmt = FORMATS.get(name.rsplit(".", 1)[-1].lower())
+    if fmt is None:
+        raise BusinessException("Dataset must be a .csv, .ndjson or .jsonl file")
+    return fmt
+
+
+# -------- Readers --------
+
+def _decode_ndjson(index: int, line: bytes) -> DatasetRow:
+    try:
+        values = json.loads(line)
+    except ValueError as exc:
+        return DatasetRow(index, error=f"Invalid JSON in dataset row {index}: {exc}")
+    if not isinstance(values, dict):
+        return DatasetRow(index, error=f"Dataset row {index} is not a JSON object")
+    return DatasetRow(index, values)
+
+
+def _ndjson_lines(path: Path) -> Iterator[bytes]:
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for line in iter(mm.readline, b""):
+                if line.strip():
+                    yield line
+
+
+def _csv_error(exc: Exception) -> BusinessException:
+    # Excel often exports GBK; ask for UTF-8 instead of failing with a 500.
+    return BusinessException(f"Dataset must be UTF-8 CSV (re-save it as \"CSV UTF-8\"): {exc}")
+
+
+def iter_rows(path: Path, indexes: Optional[Collection[int]] = None) -> Iterator[DatasetRow]:
+    """Yield the dataset's rows in order, or only those in ``indexes``.
+
+    Rows outside ``indexes`` are skipped without decoding, and reading
+    stops after the highest requested index.
+    """
+    last = max(indexes, default=-1) if indexes is not None else None
+    if dataset_format(path.name) == "ndjson":
+        for index, line in enumerate(_ndjson_lines(path)):
+            if last is not None and index > last:
+                return
+            if indexes is None or index in indexes:
+                yield _decode_ndjson(index, line)
+        return
+
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        try:
+            for index, record in enumerate(csv.DictReader(f)):
+                if last is not None and index > last:
+                    return
+                if indexes is None or index in indexes:
+                    yield DatasetRow(index, {k: v for k, v in record.items() if k is not None})
+        except (UnicodeDecodeError, csv.Error) as exc:
+            raise _csv_error(exc)
+
+
+def iter_chunks(path: Path, chunk_rows: Optional[int] = None,
+                indexes: Optional[Collection[int]] = None) -> Iterator[List[DatasetRow]]:
+    rows = iter_rows(path, indexes)
+    size = chunk_rows or settings.DATASET_CHUNK_ROWS
+    while chunk := list(itertools.islice(rows, size)):
+        yield chunk
+
+
+def describe(path: Path, dataset_id: Optional[str] = None, strict: bool = False) -> DatasetOut:
+    """Count rows and collect column names in one streaming pass.
+
+    With ``strict`` an NDJSON row that is not a JSON object is rejected;
+    otherwise it is counted and fails on its own when executed.
+    """
+    fmt = dataset_format(path.name)
+    rows = 0
+    columns: Dict[str, None] = {}
+    if fmt == "csv":
+        with open(path, newline="", encoding="utf-8-sig") as f:
+            reader = csv.DictReader(f)
+            try:
+                rows = sum(1 for _ in reader)
+            except (UnicodeDecodeError, csv.Error) as exc:
+                raise _csv_error(exc)
+            columns = dict.fromkeys(reader.fieldnames or [])
+    else:
+        for row in iter_rows(path):
+            if row.error and strict:
+                raise BusinessException(row.error)
+            if rows == 0:
+                columns = dict.fromkeys(row.values)
+            rows += 1
+    return DatasetOut(
+        id=dataset_id or path.name,
+        format=fmt,
+        size=path.stat().st_size,
+        rows=rows,
+        columns=list(columns),
+    )
+
+
+# -------- Store --------
+
+class DatasetStore:
+    """Datasets on local disk, addressed by file name under ``DATASET_DIR``."""
+
+    def __init__(self, root: Optional[str] = None, max_bytes: Optional[int] = None):
+        self.root = Path(root or settings.DATASET_DIR)
+        self.max_bytes = max_bytes or settings.DATASET_MAX_BYTES
+
+    def path(self, dataset_id: str) -> Path:
+        path = self.root / dataset_id
+        if not DATASET_ID.match(dataset_id) or not path.is_file():
+            raise NotFoundException("Dataset not found")
+        return path
+
+    async def get(self, dataset_id: str) -> DatasetOut:
+        return await asyncio.to_thread(describe, self.path(dataset_id))
+
+    async def save(self, name: str, chunks: AsyncIterator[bytes]) -> DatasetOut:
+        """Stream an upload to disk, validate it and publish it atomically."""
+        stem, _, extension = name.rpartition(".")
+        dataset_format(name)
+        stem = re.sub(r"[^A-Za-z0-9_-]+", "_", stem).strip("_")[:64] or "dataset"
+        dataset_id = f"{uuid.uuid4().hex[:12]}-{stem}.{extension.lower()}"
+
+        self.root.mkdir(parents=True, exist_ok=True)
+        partial = self.root / f".part-{dataset_id}"
+        size = 0
+        try:
+            with open(partial, "wb") as f:
+                async for chunk in chunks:
+                    size += len(chunk)
+                    if size > self.max_bytes:
+                        raise BusinessException(f"Dataset exceeds {self.max_bytes} bytes")
+                    await asyncio.to_thread(f.write, chunk)
+            info = await asyncio.to_thread(describe, partial, dataset_id, True)
+            os.replace(partial, self.root / dataset_id)
+        finally:
+            partial.unlink(missing_ok=True)
+        return info
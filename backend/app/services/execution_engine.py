@@ -0,0 +1,362 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from __future__ import annotations
+
+import asyncio
+import re
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Union
+
+import httpx
+
+from app.core.cache import get_redis_client, publish, set_json
+from app.core.config import settings
+from app.core.logger import get_logger
+from app.models.domain.execution import CaseOut, EnvironmentOut, KeyValue
+from app.services.extraction import CompiledCase, compile_case
+from app.services.outbound import OutboundControl, OutboundRejected, unguarded
+from app.services.progress_hub import SNAPSHOT_KEY, progress_state
+
+if TYPE_CHECKING:
+    from app.services.dataset import DatasetRow
+
+logger = get_logger(__name__)
+
+VARIABLE_PATTERN = re.compile(r"\{\{\s*([^{}\s]+)\s*\}\}")
+
+ResultCallback = Callable[["CaseResult"], Awaitable[None]]
+
+
+def render(template: Optional[str], variables: Dict[str, Any]) -> Optional[str]:
+    """Substitute ``{{name}}`` placeholders; unknown names are left untouched."""
+    if not template or "{{" not in template:
+        return template
+
+    def replace(match: re.Match) -> str:
+        name = match.group(1)
+        return str(variables[name]) if name in variables else match.group(0)
+
+    return VARIABLE_PATTERN.sub(replace, template)
+
+
+def _render_pairs(pairs: Iterable[KeyValue], variables: Dict[str, Any]) -> Dict[str, str]:
+    return {p.key: render(p.value, variables) for p in pairs if p.key}
+
+
+# -------- Results --------
+
+@dataclass
+class CaseResult:
+    case_id: int
+    name: str
+    module: str
+    method: str
+    url: str
+    status: str  # success / failed / error / skipped
+    status_code: Optional[int] = None
+    duration_ms: float = 0.0
+    error: Optional[str] = None
+    assertions: List[Dict[str, Any]] = field(default_factory=list)
+    extracted: Dict[str, Any] = field(default_factory=dict)
+    response_headers: Dict[str, str] = field(default_factory=dict)
+    response_body: Optional[bytes] = None
+    endpoint: str = ""  # "METHOD /templated/path", bounded cardinality for reports
+    seq: int = 0  # position in the run, the result's key in storage
+
+    @property
+    def passed(self) -> bool:
+        return self.status == "success"
+
+
+@dataclass
+class ExecutionSummary:
+    total: int = 0
+    passed: int = 0
+    failed: int = 0
+    errors: int = 0
+    skipped: int = 0
+    duration_ms: float = 0.0
+    critical_path_ms: float = 0.0
+
+    @property
+    def completed(self) -> int:
+        return self.passed + self.failed + self.errors + self.skipped
+
+    def add(self, result: CaseResult) -> None:
+        if result.status == "success":
+            self.passed += 1
+        elif result.status == "failed":
+            self.failed += 1
+        elif result.status == "skipped":
+            self.skipped += 1
+        else:
+            self.errors += 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "total": self.total,
+            "completed": self.completed,
+            "passed": self.passed,
+            "failed": self.failed,
+            "errors": self.errors,
+            "skipped": self.skipped,
+            "duration_ms": round(self.duration_ms, 3),
+            "critical_path_ms": round(self.critical_path_ms, 3),
+        }
+
+
+# -------- HTTP Client Pool --------
+
+class ClientPool:
+    """One keep-alive ``httpx.AsyncClient`` per environment.
+
+    Clients are bound to the running event loop, so a pool lives for the
+    duration of a run (or a worker loop) and must be closed with it.
+    """
+
+    def __init__(
+            self,
+            max_connections: Optional[int] = None,
+            timeout: Optional[float] = None,
+            transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        self.max_connections = max_connections or settings.EXECUTION_MAX_CONNECTIONS
+        self.timeout = timeout or settings.EXECUTION_REQUEST_TIMEOUT
+        self.transport = transport
+        self._clients: Dict[int, httpx.AsyncClient] = {}
+
+    def get(self, environment: EnvironmentOut) -> httpx.AsyncClient:
+        client = self._clients.get(environment.id)
+        if client is None:
+            client = httpx.AsyncClient(
+                base_url=environment.base_url,
+                headers=_render_pairs(environment.headers, environment.variables),
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                ),
+                timeout=httpx.Timeout(self.timeout),
+                follow_redirects=True,
+                transport=self.transport,
+            )
+            self._clients[environment.id] = client
+        return client
+
+    async def aclose(self) -> None:
+        clients, self._clients = list(self._clients.values()), {}
+        for client in clients:
+            await client.aclose()
+
+    async def __aenter__(self) -> "ClientPool":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+
+# -------- Engine --------
+
+class ExecutionEngine:
+    """Runs API cases concurrently against one environment.
+
+    Cases are scheduled as a dependency DAG (see ``app.services.scheduler``)
+    with at most ``concurrency`` in flight, or one case is run per row of a
+    dataset (``run_dataset``); every request is bounded by
+    ``timeout`` seconds end to end, passes the ``outbound`` guards when
+    given, and each finished case is published on ``execution:{id}``.
+    """
+
+    def __init__(
+            self,
+            execution_id: Union[int, str],
+            environment: EnvironmentOut,
+            pool: ClientPool,
+            variables: Optional[Dict[str, Any]] = None,
+            concurrency: Optional[int] = None,
+            timeout: Optional[float] = None,
+            on_result: Optional[ResultCallback] = None,
+            outbound: Optional[OutboundControl] = None,
+    ):
+        self.execution_id = execution_id
+        self.environment = environment
+        self.client = pool.get(environment)
+        self.variables = {**environment.variables, **(variables or {})}
+        self.concurrency = max(1, concurrency or settings.EXECUTION_CONCURRENCY)
+        self.timeout = timeout or settings.EXECUTION_REQUEST_TIMEOUT
+        self.on_result = on_result
+        self.outbound = outbound
+        self.summary = ExecutionSummary()
+        self._compiled: Dict[int, CompiledCase] = {}
+        self._snapshot_at = 0.0
+
+    @property
+    def channel(self) -> str:
+        return f"execution:{self.execution_id}"
+
+    async def run(self, cases: Sequence[CaseOut]) -> ExecutionSummary:
+        from app.services.scheduler import CaseGraph, DagScheduler
+
+        self.summary = ExecutionSummary(total=len(cases))
+        await self._publish({"type": "started", **self.summary.to_dict()})
+
+        scheduler = DagScheduler(
+            CaseGraph.build(cases),
+            self.run_case,
+            self.record,
+            self.concurrency,
+            self.variables,
+        )
+        stats = await scheduler.run()
+
+        self.summary.duration_ms = stats.wall_ms
+        self.summary.critical_path_ms = stats.critical_path_ms
+        await self._publish({"type": "finished", **self.summary.to_dict()})
+        return self.summary
+
+    async def run_dataset(self, case: CaseOut, chunks: Iterator[List[DatasetRow]], total: int) -> ExecutionSummary:
+        """Run ``case`` once per dataset row, the row's values overriding the variables.
+
+        Chunks are read in a worker thread, and only when the bounded queue
+        has room, so at most one chunk plus ``2 * concurrency`` rows are held
+        in memory whatever the dataset size. Each result's ``seq`` is its
+        row index.
+        """
+        self.summary = ExecutionSummary(total=total)
+        await self._publish({"type": "started", **self.summary.to_dict()})
+
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.concurrency * 2)
+
+        async def produce() -> None:
+            while (chunk := await asyncio.to_thread(next, chunks, None)) is not None:
+                for row in chunk:
+                    await queue.put(row)
+            for _ in range(self.concurrency):
+                await queue.put(None)
+
+        async def consume() -> None:
+            while (row := await queue.get()) is not None:
+                if row.error:
+                    result = self._new_result(case, case.path)
+                    result.error = row.error
+                else:
+                    result = await self.run_case(case, {**self.variables, **row.values})
+                result.seq = row.index
+                self.summary.critical_path_ms = max(self.summary.critical_path_ms, result.duration_ms)
+                await self.record(result)
+
+        started = time.perf_counter()
+        tasks = [asyncio.create_task(produce())]
+        tasks.extend(asyncio.create_task(consume()) for _ in range(self.concurrency))
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+            # Let in-flight requests unwind before the caller closes the client pool.
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        self.summary.duration_ms = (time.perf_counter() - started) * 1000
+        await self._publish({"type": "finished", **self.summary.to_dict()})
+        return self.summary
+
+    def _new_result(self, case: CaseOut, url: str) -> CaseResult:
+        return CaseResult(
+            case_id=case.id,
+            name=case.name,
+            module=case.module,
+            method=case.method.upper(),
+            url=url,
+            status="error",
+            endpoint=f"{case.method.upper()} {case.path}",
+        )
+
+    async def run_case(self, case: CaseOut, variables: Dict[str, Any]) -> CaseResult:
+        path = render(case.path, variables)
+        result = self._new_result(case, path)
+        request_kwargs: Dict[str, Any] = {
+            "headers": _render_pairs(case.headers, variables),
+            "params": _render_pairs(case.params, variables),
+        }
+        if case.body_type == "form":
+            request_kwargs["data"] = _render_pairs(case.form_data, variables)
+        elif case.body:
+            request_kwargs["content"] = render(case.body, variables).encode("utf-8")
+            request_kwargs["headers"].setdefault("Content-Type", "application/json")
+
+        try:
+            self.compiled(case)
+        except ValueError as exc:
+            result.error = f"Invalid expression: {exc}"
+            return result
+
+        started: Optional[float] = None
+        try:
+            permit = self.outbound.permit(self.environment, path) if self.outbound else unguarded()
+            async with permit as granted:
+                # Waiting for a token or a concurrency slot is neither latency nor part of the timeout.
+                started = time.perf_counter()
+                async with asyncio.timeout(self.timeout):
+                    response = await self.client.request(result.method, path, **request_kwargs)
+                    body = await response.aread()
+                granted.ok = response.status_code < 500
+        except OutboundRejected as exc:
+            result.error = str(exc)
+        except TimeoutError:
+            result.error = f"Request timed out after {self.timeout}s"
+        except (httpx.HTTPError, httpx.InvalidURL) as exc:
+            result.error = f"{type(exc).__name__}: {exc}"
+        except Exception as exc:
+            logger.exception("Case execution crashed", case_id=case.id)
+            result.error = f"{type(exc).__name__}: {exc}"
+        else:
+            result.url = str(response.url)
+            result.status_code = response.status_code
+            result.response_headers = dict(response.headers)
+            result.response_body = body
+            evaluation = self.compiled(case).evaluate(response.status_code, response.headers, body)
+            result.assertions = evaluation.assertions
+            result.extracted = evaluation.extracted
+            if evaluation.missing:
+                result.error = f"Extractors matched nothing: {', '.join(evaluation.missing)}"
+            result.status = "success" if evaluation.passed else "failed"
+        finally:
+            if started is not None:
+                result.duration_ms = (time.perf_counter() - started) * 1000
+        return result
+
+    def compiled(self, case: CaseOut) -> CompiledCase:
+        compiled = self._compiled.get(case.id)
+        if compiled is None:
+            compiled = self._compiled[case.id] = compile_case(case)
+        return compiled
+
+    async def record(self, result: CaseResult) -> None:
+        self.summary.add(result)
+        if self.on_result is not None:
+            await self.on_result(result)
+        await self._publish({
+            "type": "case",
+            "case_id": result.case_id,
+            "status": result.status,
+            "status_code": result.status_code,
+            "duration_ms": round(result.duration_ms, 3),
+            **self.summary.to_dict(),
+        })
+
+    async def _publish(self, event: Dict[str, Any]) -> None:
+        try:
+            await publish(self.channel, {"execution_id": self.execution_id, **event})
+            # Snapshot for late WebSocket subscribers, throttled like the frames they get.
+            now = time.monotonic()
+            if event["type"] != "case" or now - self._snapshot_at >= settings.PROGRESS_SNAPSHOT_INTERVAL:
+                self._snapshot_at = now
+                await set_json(
+                    get_redis_client(),
+                    SNAPSHOT_KEY.format(self.execution_id),
+                    progress_state(event),
+                    ex=settings.PROGRESS_SNAPSHOT_TTL,
+                )
+        except Exception as exc:
+            logger.warning("Failed to publish execution progress", execution_id=self.execution_id, error=str(exc))
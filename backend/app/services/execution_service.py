@@ -0,0 +1,173 @@
+import asyncio
+from typing import List
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from app.core.exception import BusinessException, NotFoundException
+from app.core.logger import get_logger
+from app.models.domain.execution import CaseOut, EnvironmentOut, ExecutionCreate, ExecutionOut
+from app.models.orm.execution import Execution
+from app.repositories.case_repo import CaseRepository
+from app.repositories.environment_repo import EnvironmentRepository
+from app.repositories.execution_repo import ExecutionRepository
+from app.repositories.report_repo import ReportRepository
+from app.repositories.result_repo import ResultRepository
+from app.services.dataset import DatasetStore, describe, iter_chunks
+from app.services.execution_engine import CaseResult, ClientPool, ExecutionEngine, ExecutionSummary
+from app.services.outbound import outbound_control
+from app.services.report_aggregator import ResultAggregator, read_aggregate
+from app.services.result_sink import ResultSink
+
+logger = get_logger(__name__)
+
+
+class ExecutionService:
+    def __init__(
+            self,
+            repo: ExecutionRepository,
+            case_repo: CaseRepository,
+            env_repo: EnvironmentRepository,
+            report_repo: ReportRepository,
+            result_repo: ResultRepository,
+            redis: Redis,
+            datasets: DatasetStore = None,
+    ):
+        self.repo = repo
+        self.case_repo = case_repo
+        self.env_repo = env_repo
+        self.report_repo = report_repo
+        self.result_repo = result_repo
+        self.redis = redis
+        self.datasets = datasets or DatasetStore()
+
+    async def create_execution(self, data: ExecutionCreate, executor: str = None) -> ExecutionOut:
+        if data.scope == "single" and data.case_id is None:
+            raise BusinessException("case_id is required when scope is 'single'")
+        if data.scope == "module" and not data.module:
+            raise BusinessException("module is required when scope is 'module'")
+        if data.dataset is not None:
+            if data.scope != "single":
+                raise BusinessException("A dataset can only drive a single case")
+            self.datasets.path(data.dataset)
+        if await self.env_repo.get(data.environment) is None:
+            raise NotFoundException("Environment not found")
+
+        execution = await self.repo.create(data, executor)
+        return ExecutionOut.model_validate(execution)
+
+    async def get_execution(self, execution_id: int) -> ExecutionOut:
+        execution = await self.repo.get(execution_id)
+        if execution is None:
+            raise NotFoundException("Execution not found")
+        return ExecutionOut.model_validate(execution)
+
+    async def replay_failures(self, execution_id: int, executor: str = None) -> ExecutionOut:
+        """Queue a new execution over only the dataset rows that did not pass."""
+        original = await self.repo.get(execution_id)
+        if original is None:
+            raise NotFoundException("Execution not found")
+        if not original.dataset:
+            raise BusinessException("Only dataset executions can be replayed by row")
+        rows = await self.result_repo.failed_seqs(execution_id)
+        if not rows:
+            raise BusinessException("No failed rows to replay")
+
+        data = ExecutionCreate(
+            name=f"{original.name} (replay)",
+            scope=original.scope,
+            case_id=original.case_id,
+            environment=original.environment_id,
+            parameters=original.parameters,
+            dataset=original.dataset,
+            rows=rows,
+        )
+        return await self.create_execution(data, executor)
+
+    async def load_cases(self, execution: Execution) -> List[CaseOut]:
+        if execution.scope == "single":
+            case = await self.case_repo.get(execution.case_id)
+            rows = [case] if case else []
+        elif execution.scope == "module":
+            rows = await self.case_repo.list_by_module(execution.module)
+        else:
+            rows = await self.case_repo.list_all()
+        return [CaseOut.model_validate(row) for row in rows]
+
+    async def run(self, execution_id: int) -> ExecutionSummary:
+        execution = await self.repo.get(execution_id)
+        if execution is None:
+            raise NotFoundException("Execution not found")
+        environment = await self.env_repo.get(execution.environment_id)
+        if environment is None:
+            raise NotFoundException("Environment not found")
+
+        cases = await self.load_cases(execution)
+        if execution.dataset:
+            if not cases:
+                raise NotFoundException("Case not found")
+            try:
+                path = self.datasets.path(execution.dataset)
+            except NotFoundException:
+                # The upload was checked by the API process; the worker must see the same DATASET_DIR.
+                await self.repo.mark_finished(execution, "error", 0, 0, 0.0)
+                raise NotFoundException(
+                    f"Dataset {execution.dataset} not found in {self.datasets.root} on this worker; "
+                    "DATASET_DIR must be storage shared by the API and the Celery workers"
+                )
+            rows = execution.dataset_rows
+            total = len(rows) if rows is not None else (await asyncio.to_thread(describe, path)).rows
+        else:
+            total = len(cases)
+        await self.repo.mark_running(execution, total)
+        aggregator = ResultAggregator(self.redis, execution.id)
+
+        try:
+            async with ResultSink() as sink, ClientPool() as pool:
+                async def on_result(result: CaseResult) -> None:
+                    await aggregator.add(result)
+                    await sink.add(execution.id, result)
+
+                engine = ExecutionEngine(
+                    execution.id,
+                    EnvironmentOut.model_validate(environment),
+                    pool,
+                    variables=execution.parameters,
+                    on_result=on_result,
+                    outbound=outbound_control,
+                )
+                if execution.dataset:
+                    chunks = iter_chunks(path, indexes=set(rows) if rows is not None else None)
+                    summary = await engine.run_dataset(cases[0], chunks, total)
+                else:
+                    summary = await engine.run(cases)
+            flushed = await aggregator.flush()
+        except Exception:
+            logger.exception("Execution crashed", execution_id=execution_id)
+            await self.repo.mark_finished(execution, "error", 0, 0, 0.0)
+            raise
+
+        try:
+            report = None
+            if flushed:
+                try:
+                    report = await read_aggregate(self.redis, execution.id)
+                except RedisError as exc:
+                    logger.warning("Report aggregate unavailable", execution_id=execution_id, error=str(exc))
+            if report is None:
+                # Redis missed deltas or is down: this process saw every result, so report from memory.
+                report = aggregator.summary()
+            report["critical_path_ms"] = round(summary.critical_path_ms, 3)
+            report["duration_ms"] = round(summary.duration_ms, 3)
+            await self.report_repo.save(execution.id, report)
+        except Exception:
+            logger.exception("Report save failed", execution_id=execution_id)
+
+        await self.repo.mark_finished(
+            execution,
+            "finished",
+            summary.passed,
+            summary.failed + summary.errors,
+            summary.duration_ms,
+        )
+        return summary
@@ -0,0 +1,405 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Compiled variable extraction and assertions for API case responses.
+
+Every JSONPath / regex / assertion is compiled once and kept in an LRU,
+and each response is parsed at most once no matter how many extractors
+and assertions read it. For a very large JSON body the first lookup uses
+``JsonPath.stream``, which walks the raw text along the path and stops
+at the target; any further lookup parses the document once and reuses it.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from dataclasses import dataclass, field
+from functools import cached_property, lru_cache
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Pattern, Tuple
+
+from app.core.config import settings
+from app.models.domain.execution import CaseOut
+
+KEY, INDEX, WILDCARD, DEEP = "key", "index", "wildcard", "deep"
+
+_SEGMENT = re.compile(r"""
+      \.\.(?P<deep>[^.\[\]]+)
+    | \.(?P<key>[^.\[\]]+)
+    | \[\s*(?P<index>-?\d+)\s*\]
+    | \[\s*(?P<star>\*)\s*\]
+    | \[\s*(?P<quote>['"])(?P<qkey>.*?)(?P=quote)\s*\]
+""", re.VERBOSE)
+
+_STRING = re.compile(r'"(?:[^"\\]|\\.)*"', re.DOTALL)
+_SCALAR_END = re.compile(r"[,\]}\s]")
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_DECODER = json.JSONDecoder()
+
+_INVALID = object()
+
+
+# -------- JSONPath --------
+
+class JsonPath:
+    """A parsed JSONPath (``$``, ``.key``, ``['key']``, ``[n]``, ``[*]``, ``.*``, ``..key``)."""
+
+    __slots__ = ("expression", "steps", "is_simple", "streamable")
+
+    def __init__(self, expression: str):
+        expression = expression.strip()
+        if not expression.startswith("$"):
+            raise ValueError(f"JSONPath must start with '$': {expression}")
+        steps: List[Tuple[str, Any]] = []
+        pos = 1
+        while pos < len(expression):
+            match = _SEGMENT.match(expression, pos)
+            if match is None:
+                raise ValueError(f"Invalid JSONPath at offset {pos}: {expression}")
+            pos = match.end()
+            if match.group("deep") is not None:
+                name = match.group("deep")
+                steps.append((DEEP, None if name == "*" else name))
+            elif match.group("key") is not None:
+                name = match.group("key")
+                steps.append((WILDCARD, None) if name == "*" else (KEY, name))
+            elif match.group("index") is not None:
+                steps.append((INDEX, int(match.group("index"))))
+            elif match.group("star") is not None:
+                steps.append((WILDCARD, None))
+            else:
+                steps.append((KEY, match.group("qkey")))
+        self.expression = expression
+        self.steps = tuple(steps)
+        self.is_simple = all(kind in (KEY, INDEX) for kind, _ in steps)
+        self.streamable = self.is_simple and all(arg >= 0 for kind, arg in steps if kind == INDEX)
+
+    def __repr__(self) -> str:
+        return f"JsonPath({self.expression!r})"
+
+    def find(self, document: Any) -> List[Any]:
+        """All matches, in document order."""
+        nodes = [document]
+        for kind, arg in self.steps:
+            matched: List[Any] = []
+            for node in nodes:
+                if kind == KEY:
+                    if isinstance(node, dict) and arg in node:
+                        matched.append(node[arg])
+                elif kind == INDEX:
+                    if isinstance(node, list) and -len(node) <= arg < len(node):
+                        matched.append(node[arg])
+                elif kind == WILDCARD:
+                    if isinstance(node, dict):
+                        matched.extend(node.values())
+                    elif isinstance(node, list):
+                        matched.extend(node)
+                else:
+                    matched.extend(_descend(node, arg))
+            nodes = matched
+        return nodes
+
+    def resolve(self, document: Any) -> Any:
+        """The single value for simple paths, the list of matches otherwise."""
+        if self.is_simple:
+            value = document
+            for kind, arg in self.steps:
+                if kind == KEY and isinstance(value, dict) and arg in value:
+                    value = value[arg]
+                elif kind == INDEX and isinstance(value, list) and -len(value) <= arg < len(value):
+                    value = value[arg]
+                else:
+                    raise LookupError(f"{self.expression} matched nothing")
+            return value
+        matches = self.find(document)
+        if not matches:
+            raise LookupError(f"{self.expression} matched nothing")
+        return matches
+
+    def stream(self, text: str) -> Any:
+        """Resolve a simple path directly on raw JSON text.
+
+        Only the containers on the path are walked and the scan stops at
+        the target, so values near the front of a huge body cost almost
+        nothing. Sibling objects and arrays before the target are still
+        decoded (and dropped) to find where they end.
+        """
+        if not self.streamable:
+            raise ValueError(f"Only key/non-negative index paths can be streamed: {self.expression}")
+        pos = _skip_ws(text, 0)
+        for kind, arg in self.steps:
+            pos = _stream_key(text, pos, arg) if kind == KEY else _stream_index(text, pos, arg)
+        try:
+            return _DECODER.raw_decode(text, pos)[0]
+        except ValueError:
+            raise LookupError(f"{self.expression} points at invalid JSON")
+
+
+def _descend(node: Any, key: Optional[str]) -> Iterable[Any]:
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        if isinstance(current, dict):
+            if key is None:
+                yield from current.values()
+            elif key in current:
+                yield current[key]
+            stack.extend(reversed(list(current.values())))
+        elif isinstance(current, list):
+            if key is None:
+                yield from current
+            stack.extend(reversed(current))
+
+
+def _skip_ws(text: str, pos: int) -> int:
+    return _WHITESPACE.match(text, pos).end()
+
+
+def _skip_value(text: str, pos: int) -> int:
+    char = text[pos:pos + 1]
+    if char == '"':
+        match = _STRING.match(text, pos)
+        if match is None:
+            raise LookupError("Unterminated string in JSON body")
+        return match.end()
+    if char in ("{", "["):
+        # The C scanner finds the end of a sibling subtree far faster than a
+        # Python tokenizer can, at the cost of building it; it is dropped at once.
+        try:
+            return _DECODER.raw_decode(text, pos)[1]
+        except ValueError:
+            raise LookupError("Malformed JSON body")
+    match = _SCALAR_END.search(text, pos)
+    return match.start() if match else len(text)
+
+
+def _stream_key(text: str, pos: int, key: str) -> int:
+    if text[pos:pos + 1] != "{":
+        raise LookupError(f"Expected an object for key {key!r}")
+    pos = _skip_ws(text, pos + 1)
+    while text[pos:pos + 1] != "}":
+        end = _skip_value(text, pos)
+        name = json.loads(text[pos:end])
+        pos = _skip_ws(text, end)
+        if text[pos:pos + 1] != ":":
+            raise LookupError("Malformed object in JSON body")
+        pos = _skip_ws(text, pos + 1)
+        if name == key:
+            return pos
+        pos = _skip_ws(text, _skip_value(text, pos))
+        if text[pos:pos + 1] == ",":
+            pos = _skip_ws(text, pos + 1)
+    raise LookupError(f"Key {key!r} not found")
+
+
+def _stream_index(text: str, pos: int, index: int) -> int:
+    if text[pos:pos + 1] != "[":
+        raise LookupError(f"Expected an array for index {index}")
+    pos = _skip_ws(text, pos + 1)
+    current = 0
+    while text[pos:pos + 1] != "]":
+        if current == index:
+            return pos
+        pos = _skip_ws(text, _skip_value(text, pos))
+        if text[pos:pos + 1] == ",":
+            pos = _skip_ws(text, pos + 1)
+        current += 1
+    raise LookupError(f"Index {index} out of range")
+
+
+# -------- Compilation Caches --------
+
+@lru_cache(maxsize=settings.EXPRESSION_CACHE_SIZE)
+def compile_jsonpath(expression: str) -> JsonPath:
+    return JsonPath(expression)
+
+
+@lru_cache(maxsize=settings.EXPRESSION_CACHE_SIZE)
+def compile_regex(expression: str) -> Pattern[str]:
+    try:
+        return re.compile(expression)
+    except re.error as exc:
+        raise ValueError(f"Invalid regex {expression!r}: {exc}")
+
+
+# -------- Responses --------
+
+class ResponseView:
+    """A response shared by all extractors/assertions of one case.
+
+    Text, header text and the parsed JSON document are computed lazily and
+    at most once. A large body is streamed for the first JSONPath only;
+    streaming restarts from the top, so later paths use the parsed document.
+    """
+
+    def __init__(self, status_code: int, headers: Mapping[str, str], body: bytes,
+                 streaming_threshold: Optional[int] = None):
+        self.status_code = status_code
+        self.headers = headers
+        self.body = body or b""
+        threshold = settings.STREAMING_JSON_THRESHOLD if streaming_threshold is None else streaming_threshold
+        self.streaming = len(self.body) > threshold
+        self._streamed = False
+
+    @cached_property
+    def text(self) -> str:
+        return self.body.decode("utf-8", errors="replace")
+
+    @cached_property
+    def header_text(self) -> str:
+        return "\n".join(f"{k}: {v}" for k, v in self.headers.items())
+
+    @cached_property
+    def document(self) -> Any:
+        try:
+            return json.loads(self.body) if self.body else _INVALID
+        except ValueError:
+            return _INVALID
+
+    def select(self, path: JsonPath) -> Any:
+        if self.streaming and path.streamable and not self._streamed and "document" not in self.__dict__:
+            self._streamed = True
+            return path.stream(self.text)
+        document = self.document
+        if document is _INVALID:
+            raise LookupError("Response body is not valid JSON")
+        return path.resolve(document)
+
+
+# -------- Extractors & Assertions --------
+
+@dataclass(frozen=True)
+class CompiledExtractor:
+    variable: str
+    source: str
+    regex: Optional[Pattern[str]] = None
+    path: Optional[JsonPath] = None
+    header: Optional[str] = None
+
+    def apply(self, view: ResponseView) -> Any:
+        if self.regex is not None:
+            text = view.header_text if self.source == "response_header" else view.text
+            match = self.regex.search(text)
+            if match is None:
+                raise LookupError(f"{self.regex.pattern} matched nothing")
+            return match.group(1) if match.groups() else match.group(0)
+        if self.header is not None:
+            value = view.headers.get(self.header)
+            if value is None:
+                raise LookupError(f"Header {self.header!r} not present")
+            return value
+        return view.select(self.path)
+
+
+@lru_cache(maxsize=settings.EXPRESSION_CACHE_SIZE)
+def compile_extractor(variable: str, source: str, extract_type: str, expression: str) -> CompiledExtractor:
+    if extract_type == "regex":
+        return CompiledExtractor(variable, source, regex=compile_regex(expression))
+    if source == "response_header":
+        name = expression.strip()
+        return CompiledExtractor(variable, source, header=name[2:] if name.startswith("$.") else name)
+    return CompiledExtractor(variable, source, path=compile_jsonpath(expression))
+
+
+@dataclass(frozen=True)
+class CompiledAssertion:
+    path: JsonPath
+    operator: str
+    expected: str
+    expected_number: Optional[float]
+
+    def check(self, view: ResponseView) -> Dict[str, Any]:
+        outcome = {"name": self.path.expression, "expected": self.expected, "actual": None, "result": False}
+        try:
+            outcome["actual"] = view.select(self.path)
+            outcome["result"] = self._compare(outcome["actual"])
+        except (LookupError, TypeError, ValueError) as exc:
+            outcome["error"] = str(exc)
+        return outcome
+
+    def _compare(self, actual: Any) -> bool:
+        if self.operator == "equals":
+            if isinstance(actual, (dict, list)):
+                return actual == json.loads(self.expected)
+            if isinstance(actual, bool):
+                return str(actual).lower() == self.expected.strip().lower()
+            if isinstance(actual, (int, float)) and self.expected_number is not None:
+                return actual == self.expected_number
+            return str(actual) == self.expected
+        if self.operator == "contains":
+            if isinstance(actual, list):
+                return self.expected in [str(item) for item in actual]
+            return self.expected in str(actual)
+        if self.expected_number is None:
+            raise ValueError(f"Expected value {self.expected!r} is not a number")
+        if self.operator == "greater":
+            return float(actual) > self.expected_number
+        if self.operator == "less":
+            return float(actual) < self.expected_number
+        raise ValueError(f"Unknown operator: {self.operator}")
+
+
+@lru_cache(maxsize=settings.EXPRESSION_CACHE_SIZE)
+def compile_assertion(jsonpath: str, operator: str, expected: str) -> CompiledAssertion:
+    try:
+        number: Optional[float] = float(expected)
+    except ValueError:
+        number = None
+    return CompiledAssertion(compile_jsonpath(jsonpath), operator, expected, number)
+
+
+# -------- Cases --------
+
+@dataclass
+class Evaluation:
+    assertions: List[Dict[str, Any]] = field(default_factory=list)
+    extracted: Dict[str, Any] = field(default_factory=dict)
+    missing: List[str] = field(default_factory=list)
+
+    @property
+    def passed(self) -> bool:
+        return not self.missing and all(a["result"] for a in self.assertions)
+
+
+@dataclass(frozen=True)
+class CompiledCase:
+    status_code: Optional[str]
+    assertions: Tuple[CompiledAssertion, ...]
+    extractors: Tuple[CompiledExtractor, ...]
+
+    def evaluate(self, status_code: int, headers: Mapping[str, str], body: bytes) -> Evaluation:
+        view = ResponseView(status_code, headers, body)
+        evaluation = Evaluation()
+        if self.status_code:
+            evaluation.assertions.append({
+                "name": "status_code",
+                "expected": self.status_code,
+                "actual": status_code,
+                "result": str(status_code) == self.status_code,
+            })
+        for assertion in self.assertions:
+            evaluation.assertions.append(assertion.check(view))
+        for extractor in self.extractors:
+            try:
+                evaluation.extracted[extractor.variable] = extractor.apply(view)
+            except (LookupError, TypeError, ValueError):
+                evaluation.missing.append(extractor.variable)
+        return evaluation
+
+
+def compile_case(case: CaseOut) -> CompiledCase:
+    return CompiledCase(
+        status_code=(case.assertions.status_code or "").strip() or None,
+        assertions=tuple(compile_assertion(a.jsonpath, a.operator, a.expected) for a in case.assertions.body),
+        extractors=tuple(
+            compile_extractor(e.variable, e.source, e.extract_type, e.expression) for e in case.extractors
+        ),
+    )
+
+
+def evaluate_batch(
+        compiled: CompiledCase,
+        responses: Iterable[Tuple[int, Mapping[str, str], bytes]],
+) -> List[Evaluation]:
+    """Evaluate one compiled case against many ``(status, headers, body)`` responses."""
+    return [compiled.evaluate(status, headers, body) for status, headers, body in responses]
@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Load-test mode: drive existing API cases at a target arrival rate.
+
+The scheduler is open-model: request ``k`` is due at a fixed offset from
+the start whatever happened to earlier requests, and its latency is
+measured from that *intended* start. A slow server therefore shows up as
+queueing in the latency percentiles instead of silently lowering the
+request rate (coordinated omission). The pure service time is recorded
+separately for comparison.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import math
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from redis.asyncio import Redis
+
+from app.core.cache import get_json, publish, set_json
+from app.core.config import settings
+from app.core.exception import NotFoundException
+from app.core.logger import get_logger
+from app.models.domain.execution import CaseOut, EnvironmentOut
+from app.models.domain.load_test import LoadTestCreate, LoadTestOut
+from app.repositories.case_repo import CaseRepository
+from app.repositories.environment_repo import EnvironmentRepository
+from app.services.execution_engine import ClientPool, ExecutionEngine
+from app.utils.histogram import LatencyHistogram
+
+logger = get_logger(__name__)
+
+LOAD_TEST_KEY = "loadtest:{}"
+PROGRESS_INTERVAL = 1.0
+
+
+def arrival_offset(index: int, rate: float, ramp_up: float = 0.0) -> float:
+    """Seconds after start at which the ``index``-th (0-based) arrival is due.
+
+    The rate ramps linearly from 0 to ``rate`` over ``ramp_up`` seconds, so
+    the cumulative arrival count is ``rate * t^2 / (2 * ramp_up)`` during
+    the ramp and grows by ``rate`` per second afterwards.
+    """
+    ramp_arrivals = rate * ramp_up / 2
+    if ramp_up > 0 and index < ramp_arrivals:
+        return math.sqrt(2 * index * ramp_up / rate)
+    return ramp_up + (index - ramp_arrivals) / rate
+
+
+# -------- Results --------
+
+@dataclass
+class LoadWorkerResult:
+    worker: int = 0
+    scheduled: int = 0
+    completed: int = 0
+    dropped: int = 0
+    elapsed_s: float = 0.0
+    statuses: Dict[str, int] = field(default_factory=dict)
+    latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+    service_time: LatencyHistogram = field(default_factory=LatencyHistogram)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "worker": self.worker,
+            "scheduled": self.scheduled,
+            "completed": self.completed,
+            "dropped": self.dropped,
+            "elapsed_s": self.elapsed_s,
+            "statuses": self.statuses,
+            "latency": self.latency.to_dict(),
+            "service_time": self.service_time.to_dict(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "LoadWorkerResult":
+        return cls(
+            worker=data["worker"],
+            scheduled=data["scheduled"],
+            completed=data["completed"],
+            dropped=data["dropped"],
+            elapsed_s=data["elapsed_s"],
+            statuses=dict(data["statuses"]),
+            latency=LatencyHistogram.from_dict(data["latency"]),
+            service_time=LatencyHistogram.from_dict(data["service_time"]),
+        )
+
+
+def merge_results(results: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """Combine per-worker results into one report; histograms merge losslessly."""
+    workers = [LoadWorkerResult.from_dict(r) for r in results]
+    latency = LatencyHistogram.merged(w.latency for w in workers)
+    service_time = LatencyHistogram.merged(w.service_time for w in workers)
+    statuses: Dict[str, int] = {}
+    for worker in workers:
+        for status, count in worker.statuses.items():
+            statuses[status] = statuses.get(status, 0) + count
+    completed = sum(w.completed for w in workers)
+    elapsed = max((w.elapsed_s for w in workers), default=0.0)
+    return {
+        "workers": len(workers),
+        "scheduled": sum(w.scheduled for w in workers),
+        "completed": completed,
+        "dropped": sum(w.dropped for w in workers),
+        "statuses": statuses,
+        "elapsed_s": round(elapsed, 3),
+        "achieved_rps": round(completed / elapsed, 2) if elapsed else 0.0,
+        "latency": latency.summary(),
+        "service_time": service_time.summary(),
+        "latency_histogram": latency.to_dict(),
+    }
+
+
+# -------- Open-model Runner --------
+
+class OpenModelRunner:
+    """Fires one worker's share of the arrival schedule.
+
+    ``rate`` is the global target. With ``workers`` cooperating runners,
+    worker ``w`` takes global arrivals ``w, w + workers, ...`` and all of
+    them anchor on the same wall-clock ``start_at``, so together they
+    reproduce the exact single-process schedule. A worker that boots late
+    fires its overdue arrivals immediately and their latency shows it.
+    """
+
+    def __init__(
+            self,
+            engine: ExecutionEngine,
+            cases: Sequence[CaseOut],
+            rate: float,
+            duration: float,
+            ramp_up: float = 0.0,
+            worker_index: int = 0,
+            workers: int = 1,
+            start_at: Optional[float] = None,
+            max_in_flight: Optional[int] = None,
+            channel: Optional[str] = None,
+    ):
+        if not cases:
+            raise ValueError("A load test needs at least one case")
+        self.engine = engine
+        self.cases = list(cases)
+        self.rate = rate
+        self.duration = duration
+        self.ramp_up = min(ramp_up, duration)
+        self.worker_index = worker_index
+        self.workers = workers
+        self.start_at = start_at
+        self.max_in_flight = max_in_flight or settings.LOAD_TEST_MAX_IN_FLIGHT
+        self.channel = channel
+        self.result = LoadWorkerResult(worker=worker_index)
+
+    async def _fire(self, index: int, intended: float) -> None:
+        loop = asyncio.get_running_loop()
+        case = self.cases[index % len(self.cases)]
+        outcome = await self.engine.run_case(case, self.engine.variables)
+        self.result.latency.record((loop.time() - intended) * 1_000_000)
+        self.result.service_time.record_ms(outcome.duration_ms)
+        self.result.statuses[outcome.status] = self.result.statuses.get(outcome.status, 0) + 1
+        self.result.completed += 1
+
+    async def _report_progress(self) -> None:
+        while True:
+            await asyncio.sleep(PROGRESS_INTERVAL)
+            try:
+                await publish(self.channel, {
+                    "type": "progress",
+                    "worker": self.worker_index,
+                    "scheduled": self.result.scheduled,
+                    "completed": self.result.completed,
+                    "dropped": self.result.dropped,
+                    "latency": self.result.latency.summary(),
+                })
+            except Exception as exc:
+                logger.warning("Failed to publish load test progress", error=str(exc))
+
+    async def run(self) -> LoadWorkerResult:
+        loop = asyncio.get_running_loop()
+        anchor = loop.time()
+        if self.start_at is not None:
+            anchor += self.start_at - time.time()
+
+        in_flight: set[asyncio.Task] = set()
+        reporter = asyncio.create_task(self._report_progress()) if self.channel else None
+        index = self.worker_index
+        try:
+            while True:
+                offset = arrival_offset(index, self.rate, self.ramp_up)
+                if offset >= self.duration:
+                    break
+                intended = anchor + offset
+                delay = intended - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+
+                self.result.scheduled += 1
+                if len(in_flight) >= self.max_in_flight:
+                    self.result.dropped += 1
+                else:
+                    task = asyncio.create_task(self._fire(index, intended))
+                    in_flight.add(task)
+                    task.add_done_callback(in_flight.discard)
+                index += self.workers
+
+            if in_flight:
+                await asyncio.gather(*in_flight)
+        finally:
+            if reporter is not None:
+                reporter.cancel()
+            for task in in_flight:
+                task.cancel()
+
+        self.result.elapsed_s = loop.time() - anchor
+        return self.result
+
+
+# -------- Service --------
+
+class LoadTestService:
+    def __init__(self, case_repo: CaseRepository, env_repo: EnvironmentRepository, redis: Redis):
+        self.case_repo = case_repo
+        self.env_repo = env_repo
+        self.redis = redis
+
+    async def _save(self, record: LoadTestOut) -> None:
+        await set_json(
+            self.redis,
+            LOAD_TEST_KEY.format(record.id),
+            record.model_dump(mode="json"),
+            ex=settings.LOAD_TEST_RESULT_TTL,
+        )
+
+    async def _load_cases(self, case_ids: List[int]) -> List[CaseOut]:
+        rows = await self.case_repo.list_by_ids(case_ids)
+        missing = set(case_ids) - {row.id for row in rows}
+        if missing:
+            raise NotFoundException(f"Cases not found: {sorted(missing)}")
+        return [CaseOut.model_validate(row) for row in rows]
+
+    async def create(self, data: LoadTestCreate) -> LoadTestOut:
+        if await self.env_repo.get(data.environment) is None:
+            raise NotFoundException("Environment not found")
+        await self._load_cases(data.case_ids)
+
+        record = LoadTestOut(id=uuid.uuid4().hex, status="running", config=data)
+        await self._save(record)
+        return record
+
+    async def get(self, load_test_id: str) -> LoadTestOut:
+        data = await get_json(self.redis, LOAD_TEST_KEY.format(load_test_id))
+        if data is None:
+            raise NotFoundException("Load test not found")
+        return LoadTestOut(**data)
+
+    async def run_worker(self, load_test_id: str, config: LoadTestCreate, worker_index: int,
+                         start_at: float) -> Dict[str, Any]:
+        environment = await self.env_repo.get(config.environment)
+        if environment is None:
+            raise NotFoundException("Environment not found")
+        cases = await self._load_cases(config.case_ids)
+
+        # Every in-flight arrival needs its own connection, or it queues in httpx instead of counting as dropped.
+        async with ClientPool(max_connections=settings.LOAD_TEST_MAX_IN_FLIGHT) as pool:
+            engine = ExecutionEngine(
+                load_test_id,
+                EnvironmentOut.model_validate(environment),
+                pool,
+                variables=config.parameters,
+            )
+            runner = OpenModelRunner(
+                engine,
+                cases,
+                rate=config.rate,
+                duration=config.duration,
+                ramp_up=config.ramp_up,
+                worker_index=worker_index,
+                workers=config.workers,
+                start_at=start_at,
+                channel=LOAD_TEST_KEY.format(load_test_id),
+            )
+            result = await runner.run()
+        return result.to_dict()
+
+    async def finish(self, load_test_id: str, results: List[Dict[str, Any]]) -> Dict[str, Any]:
+        record = await self.get(load_test_id)
+        record.status = "finished"
+        record.result = merge_results(results)
+        await self._save(record)
+        await publish(LOAD_TEST_KEY.format(load_test_id), {"type": "finished", **record.result})
+        return record.result
+
+    async def fail(self, load_test_id: str, error: str) -> None:
+        """Mark the load test as errored when a worker crashed and the merge never ran."""
+        record = await self.get(load_test_id)
+        record.status = "error"
+        record.error = error
+        await self._save(record)
+        await publish(LOAD_TEST_KEY.format(load_test_id), {"type": "error", "error": error})
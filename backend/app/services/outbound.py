@@ -0,0 +1,339 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Outbound traffic control for execution requests, per environment and host.
+
+Every request to a target host passes one :class:`HostGuard`, which
+applies three checks in order:
+
+* a circuit breaker fails the request at once while the host's recent
+  error rate (connection errors, timeouts, 5xx) is above
+  ``OUTBOUND_BREAKER_ERROR_RATE``. The open state is mirrored to Redis so
+  every worker and Celery process stops hammering a dead environment,
+  not only the one that noticed;
+* a token bucket in Redis, updated atomically by a Lua script, enforces
+  the host's request rate across all processes. The script reserves a
+  token and returns how long to wait for it, so one round trip suffices;
+* an adaptive concurrency limit (AIMD) grows slowly while latency stays
+  near its baseline and shrinks when latency or errors climb.
+
+Keys share the ``{<environment>:<host>}`` hash tag, so they stay on one
+shard. The process-wide :data:`outbound_control` keeps one guard per
+(environment, host), so concurrent and successive runs in a process share
+the same limiter and breaker window.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import math
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import AsyncIterator, Callable, Deque, Dict, Optional, Set, Tuple, Union
+
+import httpx
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from app.core.cache import get_redis_client, node_for
+from app.core.config import settings
+from app.core.logger import get_logger
+from app.core.sharding import ShardedRedis
+from app.models.domain.execution import EnvironmentOut
+
+logger = get_logger(__name__)
+
+GUARD_KEY = "outbound:{{{}:{}}}"
+
+# KEYS[1] bucket hash; ARGV rate (tokens/s), burst, max wait (ms), ttl (ms).
+# Returns the wait in ms for the reserved token, or -1 if it exceeds the max wait.
+TOKEN_BUCKET_LUA = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) * 1000 + tonumber(clock[2]) / 1000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or burst
+local ts = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - ts) * rate / 1000) - 1
+local wait = 0
+if tokens < 0 then
+    wait = -tokens * 1000 / rate
+    if wait > tonumber(ARGV[3]) then
+        return -1
+    end
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('PEXPIRE', KEYS[1], ARGV[4])
+return math.ceil(wait)
+"""
+
+
+class OutboundRejected(Exception):
+    """The request was not sent: circuit open or rate limit wait too long."""
+
+
+@dataclass
+class Permit:
+    ok: bool = False  # set by the caller once the host answered below 500
+
+
+@asynccontextmanager
+async def unguarded() -> AsyncIterator[Permit]:
+    yield Permit()
+
+
+# -------- Circuit Breaker --------
+
+class CircuitBreaker:
+    """Rolling-window error-rate breaker with a single half-open probe."""
+
+    def __init__(
+            self,
+            window: Optional[int] = None,
+            min_requests: Optional[int] = None,
+            error_rate: Optional[float] = None,
+            cooldown: Optional[float] = None,
+            clock: Callable[[], float] = time.monotonic,
+    ):
+        self.window: Deque[bool] = deque(maxlen=window or settings.OUTBOUND_BREAKER_WINDOW)
+        self.min_requests = min_requests or settings.OUTBOUND_BREAKER_MIN_REQUESTS
+        self.error_rate = error_rate or settings.OUTBOUND_BREAKER_ERROR_RATE
+        self.cooldown = cooldown or settings.OUTBOUND_BREAKER_COOLDOWN
+        self.clock = clock
+        self.state = "closed"
+        self.open_until = 0.0
+        self._probing = False
+
+    def allow(self) -> bool:
+        if self.state == "closed":
+            return True
+        if self.state == "open":
+            if self.clock() < self.open_until:
+                return False
+            self.state = "half_open"
+        if self._probing:
+            return False
+        self._probing = True
+        return True
+
+    def abandon(self) -> None:
+        """The admitted request was never sent; let another one probe."""
+        self._probing = False
+
+    def record(self, ok: bool) -> bool:
+        """Record an outcome; returns True when this outcome opened the circuit."""
+        if self.state == "half_open" and self._probing:
+            self._probing = False
+            if ok:
+                self.state = "closed"
+                self.window.clear()
+                return False
+            self.open_for(self.cooldown)
+            return True
+        if self.state != "closed":
+            return False
+
+        self.window.append(ok)
+        errors = self.window.count(False)
+        if len(self.window) >= self.min_requests and errors >= self.error_rate * len(self.window):
+            self.open_for(self.cooldown)
+            return True
+        return False
+
+    def open_for(self, seconds: float) -> None:
+        self.state = "open"
+        self.open_until = max(self.open_until, self.clock() + seconds)
+        self.window.clear()
+
+
+# -------- Adaptive Concurrency --------
+
+class AdaptiveLimiter:
+    """AIMD concurrency limit driven by latency against a slowly moving baseline.
+
+    The baseline snaps down to any faster sample and otherwise drifts up by
+    1% of the gap (0.1% for overloaded samples), so it adopts a genuine
+    shift eventually without being dragged up by an overload.
+    The limit shrinks by 10% at most once per ``limit`` completions.
+    """
+
+    def __init__(self, max_limit: int, min_limit: Optional[int] = None, tolerance: Optional[float] = None):
+        self.max_limit = max(1, max_limit)
+        self.min_limit = min(self.max_limit, min_limit or settings.OUTBOUND_MIN_CONCURRENCY)
+        self.tolerance = tolerance or settings.OUTBOUND_LATENCY_TOLERANCE
+        self.limit = float(self.max_limit)
+        self.in_flight = 0
+        self.baseline_ms: Optional[float] = None
+        self._since_decrease = self.max_limit  # the first overload may act at once
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    async def acquire(self) -> None:
+        while self.in_flight >= int(self.limit):
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+                elif waiter.done():
+                    self._wake()  # pass on the slot this waiter was given
+                raise
+        self.in_flight += 1
+
+    def release(self, latency_ms: float, ok: bool) -> None:
+        self.in_flight -= 1
+        self._since_decrease += 1
+        overloaded = not ok
+        if ok:
+            if self.baseline_ms is None or latency_ms < self.baseline_ms:
+                self.baseline_ms = latency_ms
+            overloaded = latency_ms > self.baseline_ms * self.tolerance
+            self.baseline_ms += (latency_ms - self.baseline_ms) * (0.001 if overloaded else 0.01)
+
+        if overloaded:
+            if self._since_decrease >= self.limit:
+                self.limit = max(self.min_limit, self.limit * 0.9)
+                self._since_decrease = 0
+        else:
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+        self._wake()
+
+    def _wake(self) -> None:
+        free = int(self.limit) - self.in_flight
+        while free > 0 and self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                free -= 1
+
+
+# -------- Guards --------
+
+class HostGuard:
+
+    def __init__(
+            self,
+            redis: Optional[Union[Redis, ShardedRedis]],
+            environment_id: int,
+            host: str,
+            rate: float,
+            burst: int,
+            max_concurrency: int,
+    ):
+        self._redis = redis
+        self.host = host
+        self.rate = rate
+        self.burst = burst
+        self.policy = (rate, burst, max_concurrency)
+        self.key = GUARD_KEY.format(environment_id, host)
+        self.bucket_key = f"{self.key}:bucket"
+        self.open_key = f"{self.key}:open"
+        self.breaker = CircuitBreaker()
+        self.limiter = AdaptiveLimiter(max_concurrency)
+        self._synced_at = float("-inf")
+        self._background: Set[asyncio.Task] = set()
+
+    @property
+    def redis(self) -> Union[Redis, ShardedRedis]:
+        # Resolved per use: Celery tasks re-create the client for every run.
+        return self._redis or get_redis_client()
+
+    async def _sync_breaker(self) -> None:
+        """Adopt an open circuit recorded by another process."""
+        now = time.monotonic()
+        if now - self._synced_at < settings.OUTBOUND_BREAKER_SYNC_INTERVAL:
+            return
+        self._synced_at = now
+        try:
+            ttl_ms = await self.redis.pttl(self.open_key)
+        except RedisError as exc:
+            logger.warning("Outbound breaker sync failed", host=self.host, error=str(exc))
+            return
+        if ttl_ms and ttl_ms > 0 and self.breaker.state == "closed":
+            self.breaker.open_for(ttl_ms / 1000)
+
+    async def _publish_open(self) -> None:
+        try:
+            await self.redis.set(self.open_key, b"1", px=int(self.breaker.cooldown * 1000))
+        except RedisError as exc:
+            logger.warning("Outbound breaker publish failed", host=self.host, error=str(exc))
+
+    async def _take_token(self) -> None:
+        if self.rate <= 0:
+            return
+        node = node_for(self.redis, self.bucket_key)
+        ttl_ms = int(max(1.0, self.burst / self.rate) * 2000)
+        try:
+            wait_ms = await node.eval(
+                TOKEN_BUCKET_LUA, 1, self.bucket_key,
+                self.rate, self.burst, int(settings.OUTBOUND_MAX_WAIT * 1000), ttl_ms,
+            )
+        except RedisError as exc:
+            # Fail open: an unavailable limiter must not fail the whole run.
+            logger.warning("Outbound rate limiter unavailable", host=self.host, error=str(exc))
+            return
+        if wait_ms < 0:
+            raise OutboundRejected(f"Rate limit for {self.host}: no slot within {settings.OUTBOUND_MAX_WAIT}s")
+        if wait_ms:
+            await asyncio.sleep(wait_ms / 1000)
+
+    @asynccontextmanager
+    async def permit(self) -> AsyncIterator[Permit]:
+        await self._sync_breaker()
+        if not self.breaker.allow():
+            raise OutboundRejected(f"Circuit open for {self.host}: failing fast")
+        try:
+            await self._take_token()
+            await self.limiter.acquire()
+        except BaseException:
+            self.breaker.abandon()
+            raise
+
+        permit = Permit()
+        started = time.perf_counter()
+        try:
+            yield permit
+        finally:
+            self.limiter.release((time.perf_counter() - started) * 1000, permit.ok)
+            if self.breaker.record(permit.ok):
+                logger.warning("Outbound circuit opened", host=self.host, cooldown=self.breaker.cooldown)
+                task = asyncio.create_task(self._publish_open())
+                self._background.add(task)
+                task.add_done_callback(self._background.discard)
+
+
+class OutboundControl:
+    """The guards of one process, one per (environment, host); shared state lives in Redis."""
+
+    def __init__(self, redis: Optional[Union[Redis, ShardedRedis]] = None, concurrency: Optional[int] = None):
+        self._redis = redis
+        self.concurrency = concurrency or settings.EXECUTION_CONCURRENCY
+        self._guards: Dict[Tuple[int, str], HostGuard] = {}
+
+    def guard(self, environment: EnvironmentOut, path: str) -> HostGuard:
+        try:
+            url = httpx.URL(path)
+        except httpx.InvalidURL:
+            url = None  # the request itself reports the error; guard it as the environment's
+        host = url.host if url is not None and url.is_absolute_url else httpx.URL(environment.base_url).host
+        policy = environment.outbound
+        rate = settings.OUTBOUND_RATE_LIMIT if policy is None or policy.rate is None else policy.rate
+        burst = (policy and policy.burst) or settings.OUTBOUND_BURST or max(1, math.ceil(rate))
+        max_concurrency = (policy and policy.max_concurrency) or self.concurrency
+        guard = self._guards.get((environment.id, host))
+        # A guard outlives the run; rebuild it when the environment's policy was edited.
+        if guard is None or guard.policy != (rate, burst, max_concurrency):
+            guard = self._guards[(environment.id, host)] = HostGuard(
+                self._redis, environment.id, host, rate, burst, max_concurrency,
+            )
+        return guard
+
+    def permit(self, environment: EnvironmentOut, path: str):
+        return self.guard(environment, path).permit()
+
+
+outbound_control = OutboundControl()
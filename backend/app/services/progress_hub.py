@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Live execution progress fan-out for WebSocket clients.
+
+One :class:`ProgressHub` per process holds a single Redis subscription and
+subscribes to ``execution:{id}`` only while at least one connection
+watches that execution. It folds every engine event into the latest
+state per execution: a fixed set of counters plus the run status.
+
+Each connection is a :class:`Subscription`. It keeps only the newest
+state per execution and sends at most ``PROGRESS_MAX_FPS`` frames per
+second. A fast run or a slow browser therefore costs a bounded amount of
+memory and bandwidth, never a backlog of events.
+
+Late subscribers start from a snapshot. That is the hub's own latest
+state if the execution is already watched in this process; otherwise it
+is the copy the engine writes to ``execution:{id}:snapshot``, throttled.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Set, Union
+
+from redis.asyncio import Redis
+from redis.asyncio.client import PubSub
+
+from app.core.cache import get_json, get_redis_client
+from app.core.config import settings
+from app.core.logger import get_logger
+from app.core.sharding import ShardedRedis
+
+logger = get_logger(__name__)
+
+CHANNEL = "execution:{}"
+SNAPSHOT_KEY = "execution:{}:snapshot"
+COUNTERS = ("total", "completed", "passed", "failed", "errors", "skipped", "duration_ms", "critical_path_ms")
+STATUS_BY_EVENT = {"started": "running", "case": "running", "finished": "finished"}
+
+Send = Callable[[Dict[str, Any]], Awaitable[None]]
+
+
+def progress_state(event: Dict[str, Any], previous: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Fold an engine event into the latest counters for its execution."""
+    state = dict(previous or {})
+    state.update({name: event[name] for name in COUNTERS if name in event})
+    state["status"] = STATUS_BY_EVENT.get(event.get("type"), state.get("status", "running"))
+    state["updated_at"] = time.time()
+    return state
+
+
+def newer(current: Optional[Dict[str, Any]], candidate: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Pick the state further along; counters only ever grow within a run."""
+    if current is None or candidate is None:
+        return current or candidate
+    rank = lambda s: (s.get("status") == "finished", s.get("completed", 0))
+    return candidate if rank(candidate) > rank(current) else current
+
+
+class Subscription:
+    """One WebSocket connection's view: coalesced, rate-limited frames."""
+
+    def __init__(self, send: Send, max_fps: Optional[float] = None):
+        self.send = send
+        self.interval = 1.0 / (max_fps or settings.PROGRESS_MAX_FPS)
+        self.executions: Set[int] = set()
+        self._pending: Dict[int, Dict[str, Any]] = {}
+        self._wakeup = asyncio.Event()
+
+    def offer(self, execution_id: int, state: Dict[str, Any]) -> None:
+        self._pending[execution_id] = state
+        self._wakeup.set()
+
+    def discard(self, execution_id: int) -> None:
+        self._pending.pop(execution_id, None)
+
+    async def run(self) -> None:
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            pending, self._pending = self._pending, {}
+            if pending:
+                await self.send({"type": "progress", "executions": pending})
+                await asyncio.sleep(self.interval)
+
+
+class ProgressHub:
+
+    def __init__(self, redis: Optional[Union[Redis, ShardedRedis]] = None):
+        self._redis = redis
+        self._pubsub: Optional[PubSub] = None
+        self._reader: Optional[asyncio.Task] = None
+        self._watchers: Dict[int, Set[Subscription]] = {}
+        self._latest: Dict[int, Dict[str, Any]] = {}
+        self._lock = asyncio.Lock()
+
+    @property
+    def redis(self) -> Union[Redis, ShardedRedis]:
+        return self._redis or get_redis_client()
+
+    # -------- Subscriptions --------
+
+    async def watch(self, subscription: Subscription, execution_ids: Iterable[int]) -> Dict[int, Dict[str, Any]]:
+        """Start forwarding updates; returns a snapshot for each execution that has one."""
+        requested = list(execution_ids)
+        new_channels = []
+        async with self._lock:
+            for execution_id in requested:
+                if execution_id in subscription.executions:
+                    continue
+                subscription.executions.add(execution_id)
+                watchers = self._watchers.setdefault(execution_id, set())
+                if not watchers:
+                    new_channels.append(CHANNEL.format(execution_id))
+                watchers.add(subscription)
+            if new_channels:
+                if self._pubsub is None:
+                    self._pubsub = self.redis.pubsub()
+                # Subscribe before reading snapshots so nothing falls in between.
+                await self._pubsub.subscribe(*new_channels)
+                if self._reader is None:
+                    self._reader = asyncio.create_task(self._read())
+
+        snapshots = {}
+        for execution_id in requested:
+            stored = await get_json(self.redis, SNAPSHOT_KEY.format(execution_id))
+            state = newer(self._latest.get(execution_id), stored)
+            if state is not None:
+                self._latest[execution_id] = state
+                snapshots[execution_id] = state
+        return snapshots
+
+    async def unwatch(self, subscription: Subscription, execution_ids: Optional[Iterable[int]] = None) -> None:
+        ids = list(subscription.executions if execution_ids is None else execution_ids)
+        stale_channels = []
+        async with self._lock:
+            for execution_id in ids:
+                subscription.executions.discard(execution_id)
+                subscription.discard(execution_id)
+                watchers = self._watchers.get(execution_id)
+                if watchers is None:
+                    continue
+                watchers.discard(subscription)
+                if not watchers:
+                    del self._watchers[execution_id]
+                    self._latest.pop(execution_id, None)
+                    stale_channels.append(CHANNEL.format(execution_id))
+            if stale_channels and self._pubsub is not None:
+                await self._pubsub.unsubscribe(*stale_channels)
+
+    # -------- Fan-out --------
+
+    def dispatch(self, channel: Union[str, bytes], data: Union[str, bytes]) -> None:
+        if isinstance(channel, bytes):
+            channel = channel.decode("utf-8")
+        try:
+            execution_id = int(channel.split(":", 1)[1])
+            event = json.loads(data)
+        except (IndexError, ValueError):
+            return
+        watchers = self._watchers.get(execution_id)
+        if not watchers:
+            return
+        state = self._latest[execution_id] = progress_state(event, self._latest.get(execution_id))
+        for subscription in watchers:
+            subscription.offer(execution_id, state)
+
+    async def _read(self) -> None:
+        while True:
+            try:
+                if not self._pubsub.subscribed:
+                    await asyncio.sleep(1.0)
+                    continue
+                message = await self._pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning("Progress subscription failed, retrying", error=str(exc))
+                await asyncio.sleep(1.0)
+                continue
+            if message is not None:
+                self.dispatch(message["channel"], message["data"])
+
+    async def close(self) -> None:
+        if self._reader is not None:
+            self._reader.cancel()
+            try:
+                await self._reader
+            except asyncio.CancelledError:
+                pass
+            self._reader = None
+        if self._pubsub is not None:
+            await self._pubsub.aclose()
+            self._pubsub = None
+        self._watchers.clear()
+        self._latest.clear()
+
+
+progress_hub = ProgressHub()
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Incremental, mergeable report aggregates for executions.
+
+Each worker accumulates counter deltas and latency-histogram bucket counts
+in memory and flushes them to two Redis hashes with HINCRBY, so any
+number of workers can feed the same execution and a report is always a
+read of two fixed-size hashes, never a scan of stored results.
+
+    report:{<id>}:counts   "<dimension>\\t<name>\\t<field>" -> number
+    report:{<id>}:latency  "<bucket index>"                -> count
+
+The ``{<id>}`` hash tag keeps both hashes on one shard. Each aggregator
+also keeps running totals of what it has seen, so the process that ran a
+whole execution can still build its report while Redis is unavailable.
+"""
+
+from __future__ import annotations
+
+import time
+from collections import Counter, defaultdict
+from typing import Any, Dict, Optional, Union
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from app.core.cache import node_for
+from app.core.config import settings
+from app.core.logger import get_logger
+from app.core.sharding import ShardedRedis
+from app.services.execution_engine import CaseResult
+from app.utils.histogram import LatencyHistogram, bucket_index
+
+COUNTS_KEY = "report:{{{}}}:counts"
+LATENCY_KEY = "report:{{{}}}:latency"
+SEP = "\t"
+
+logger = get_logger(__name__)
+
+STATUSES = ("success", "failed", "error", "skipped")
+
+
+def _field(dimension: str, name: str, metric: str) -> str:
+    return f"{dimension}{SEP}{name}{SEP}{metric}"
+
+
+class ResultAggregator:
+    """Accumulates per-result deltas and flushes them by count or time.
+
+    ``summary()`` reports everything this aggregator has added, from memory.
+    """
+    def __init__(
+            self,
+            redis: Union[Redis, ShardedRedis],
+            execution_id: int,
+            flush_every: Optional[int] = None,
+            flush_interval: Optional[float] = None,
+    ):
+        self.redis = redis
+        self.execution_id = execution_id
+        self.counts_key = COUNTS_KEY.format(execution_id)
+        self.latency_key = LATENCY_KEY.format(execution_id)
+        self.flush_every = flush_every or settings.REPORT_FLUSH_EVERY
+        self.flush_interval = flush_interval or settings.REPORT_FLUSH_INTERVAL
+        self._counts: Counter = Counter()
+        self._durations: Dict[str, float] = defaultdict(float)
+        self._latency: Counter = Counter()
+        self._pending = 0
+        self._last_flush = time.monotonic()
+        self._totals: Counter = Counter()
+        self._total_latency: Counter = Counter()
+
+    async def add(self, result: CaseResult) -> None:
+        status = result.status
+        for dimension, name in (("all", ""), ("module", result.module), ("endpoint", result.endpoint)):
+            field = _field(dimension, name, status)
+            self._counts[field] += 1
+            self._totals[field] += 1
+            if status != "skipped":
+                field = _field(dimension, name, "duration_ms")
+                self._durations[field] += result.duration_ms
+                self._totals[field] += result.duration_ms
+        if status != "skipped":
+            bucket = bucket_index(int(result.duration_ms * 1000))
+            self._latency[str(bucket)] += 1
+            self._total_latency[bucket] += 1
+
+        self._pending += 1
+        if self._pending >= self.flush_every or time.monotonic() - self._last_flush >= self.flush_interval:
+            await self.flush()
+
+    async def flush(self) -> bool:
+        """Write the pending deltas; returns False on a Redis error and keeps them for the next flush."""
+        self._last_flush = time.monotonic()
+        if not self._pending:
+            return True
+        counts, self._counts = self._counts, Counter()
+        durations, self._durations = self._durations, defaultdict(float)
+        latency, self._latency = self._latency, Counter()
+        pending, self._pending = self._pending, 0
+
+        pipe = node_for(self.redis, self.counts_key).pipeline(transaction=False)
+        for field, value in counts.items():
+            pipe.hincrby(self.counts_key, field, value)
+        for field, value in durations.items():
+            pipe.hincrbyfloat(self.counts_key, field, value)
+        for field, value in latency.items():
+            pipe.hincrby(self.latency_key, field, value)
+        pipe.expire(self.counts_key, settings.REPORT_TTL)
+        pipe.expire(self.latency_key, settings.REPORT_TTL)
+        try:
+            await pipe.execute()
+        except RedisError as exc:
+            # The report must not fail the run; MySQL stays the source of truth.
+            logger.warning("Report flush failed, keeping deltas", execution_id=self.execution_id, error=str(exc))
+            self._counts.update(counts)
+            for field, value in durations.items():
+                self._durations[field] += value
+            self._latency.update(latency)
+            self._pending += pending
+            return False
+        return True
+
+    def summary(self) -> Dict[str, Any]:
+        return build_summary(dict(self._totals), dict(self._total_latency))
+
+
+async def read_aggregate(redis: Union[Redis, ShardedRedis], execution_id: int) -> Optional[Dict[str, Any]]:
+    """Build the report summary from Redis, or ``None`` if it has expired."""
+    counts_key = COUNTS_KEY.format(execution_id)
+    latency_key = LATENCY_KEY.format(execution_id)
+    pipe = node_for(redis, counts_key).pipeline(transaction=False)
+    pipe.hgetall(counts_key)
+    pipe.hgetall(latency_key)
+    counts, latency = await pipe.execute()
+    if not counts:
+        return None
+    decode = lambda v: v.decode("utf-8") if isinstance(v, bytes) else v
+    return build_summary(
+        {decode(k): float(v) for k, v in counts.items()},
+        {int(decode(k)): int(v) for k, v in latency.items()},
+    )
+
+
+def build_summary(counts: Dict[str, float], latency: Dict[int, int]) -> Dict[str, Any]:
+    groups: Dict[str, Dict[str, Dict[str, float]]] = {"all": {}, "module": {}, "endpoint": {}}
+    for field, value in counts.items():
+        dimension, name, metric = field.split(SEP, 2)
+        groups.setdefault(dimension, {}).setdefault(name, {})[metric] = value
+
+    def describe(metrics: Dict[str, float]) -> Dict[str, Any]:
+        by_status = {status: int(metrics.get(status, 0)) for status in STATUSES}
+        total = sum(by_status.values())
+        executed = total - by_status["skipped"]
+        return {
+            "total": total,
+            "passed": by_status["success"],
+            "failed": by_status["failed"],
+            "errors": by_status["error"],
+            "skipped": by_status["skipped"],
+            "pass_rate": round(by_status["success"] * 100 / total, 2) if total else 0.0,
+            "avg_ms": round(metrics.get("duration_ms", 0.0) / executed, 3) if executed else 0.0,
+        }
+
+    overall = describe(groups["all"].get("", {}))
+    histogram = LatencyHistogram.from_counts(
+        latency, total_sum=int(groups["all"].get("", {}).get("duration_ms", 0.0) * 1000)
+    )
+    return {
+        **overall,
+        "modules": {name: describe(metrics) for name, metrics in sorted(groups["module"].items())},
+        "endpoints": {name: describe(metrics) for name, metrics in sorted(groups["endpoint"].items())},
+        "latency": histogram.summary(),
+        "latency_histogram": histogram.to_dict(),
+    }
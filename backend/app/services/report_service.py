@@ -0,0 +1,23 @@
+from typing import Any, Dict
+
+from redis.asyncio import Redis
+
+from app.core.exception import NotFoundException
+from app.repositories.report_repo import ReportRepository
+from app.services.report_aggregator import read_aggregate
+
+
+class ReportService:
+    def __init__(self, repo: ReportRepository, redis: Redis):
+        self.repo = repo
+        self.redis = redis
+
+    async def get_report(self, execution_id: int) -> Dict[str, Any]:
+        summary = await read_aggregate(self.redis, execution_id)
+        if summary is not None:
+            return summary
+
+        report = await self.repo.get(execution_id)
+        if report is None:
+            raise NotFoundException("Report not found")
+        return report.summary
@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Write-behind persistence for case results.
+
+Results are appended to a local journal segment (one JSON line each) and
+buffered in memory; the buffer is written to MySQL as multi-row inserts
+every ``RESULT_BATCH_SIZE`` results, ``RESULT_BUFFER_MAX_BYTES`` of
+journal or ``RESULT_FLUSH_INTERVAL`` seconds, whichever comes first.
+Encoding, journal appends and replay reads run in worker threads.
+A segment is deleted only after its batch has committed, so:
+
+* a crashed process leaves its segment behind and the next sink replays it;
+* a flush that exceeds ``RESULT_FLUSH_TIMEOUT`` leaves the batch spilled on
+  disk, frees the memory and is retried later, so a slow MySQL never stalls
+  the execution engine or grows the heap.
+
+Replays are idempotent because rows are keyed by ``(execution_id, seq)``
+and a duplicate key leaves the stored row untouched. Only timeouts and lost
+connections are retried; a segment MySQL rejects for any other reason is
+renamed to ``*.failed`` for inspection so it cannot block later segments.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+import itertools
+import json
+import os
+import zlib
+from pathlib import Path
+from typing import Any, Awaitable, Callable, List, Optional, Tuple
+
+from sqlalchemy.exc import DBAPIError, InterfaceError, OperationalError
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.core.logger import get_logger
+from app.repositories.result_repo import ResultRepository
+from app.services.execution_engine import CaseResult
+
+logger = get_logger(__name__)
+
+Writer = Callable[[List[dict], List[dict]], Awaitable[None]]
+
+ACTIVE_SUFFIX = ".active"
+SEALED_SUFFIX = ".ndjson"
+REPLAYING_MARK = ".replaying-"
+FAILED_SUFFIX = ".failed"
+
+
+async def insert_rows(summaries: List[dict], details: List[dict]) -> None:
+    async with AsyncSessionLocal() as db:
+        await ResultRepository(db).insert_many(summaries, details)
+
+
+def to_rows(execution_id: int, result: CaseResult) -> Tuple[dict, dict]:
+    """Split a result into its hot summary row and its cold detail row."""
+    body = (result.response_body or b"")[:settings.RESULT_BODY_MAX_BYTES]
+    compressed = len(body) > settings.RESULT_BODY_COMPRESS_THRESHOLD
+    summary = {
+        "execution_id": execution_id,
+        "seq": result.seq,
+        "case_id": result.case_id,
+        "name": result.name[:255],
+        "module": result.module[:255],
+        "endpoint": result.endpoint[:1024],
+        "status": result.status,
+        "status_code": result.status_code,
+        "duration_ms": round(result.duration_ms, 3),
+        "error": result.error,
+    }
+    detail = {
+        "execution_id": execution_id,
+        "seq": result.seq,
+        "url": result.url,
+        "response_headers": result.response_headers,
+        "assertions": result.assertions,
+        "extracted": result.extracted,
+        "body": zlib.compress(body, 6) if compressed else body,
+        "body_compressed": compressed,
+        "body_size": len(result.response_body or b""),
+    }
+    return summary, detail
+
+
+def _encode(summary: dict, detail: dict) -> bytes:
+    detail = {**detail, "body": base64.b64encode(detail["body"]).decode("ascii")}
+    return json.dumps({"s": summary, "d": detail}, ensure_ascii=False, default=str).encode("utf-8") + b"\n"
+
+
+def _journal_entry(execution_id: int, result: CaseResult) -> Tuple[dict, dict, bytes]:
+    summary, detail = to_rows(execution_id, result)
+    return summary, detail, _encode(summary, detail)
+
+
+def _decode(line: bytes) -> Tuple[dict, dict]:
+    record = json.loads(line)
+    detail = record["d"]
+    detail["body"] = base64.b64decode(detail["body"])
+    return record["s"], detail
+
+
+def _read_segment(path: Path) -> List[Tuple[dict, dict]]:
+    rows = []
+    with open(path, "rb") as f:
+        for line in f:
+            try:
+                rows.append(_decode(line))
+            except ValueError:
+                logger.warning("Skipping torn journal line", segment=str(path))
+    return rows
+
+
+def _sealed_path(path: Path) -> Path:
+    return path.with_name(path.name.split(".", 1)[0] + SEALED_SUFFIX)
+
+
+def _is_transient(exc: BaseException) -> bool:
+    """Whether a writer error may go away on retry: timeouts and lost connections."""
+    if isinstance(exc, (TimeoutError, OSError, PoolTimeoutError, OperationalError, InterfaceError)):
+        return True
+    return isinstance(exc, DBAPIError) and exc.connection_invalidated
+
+
+def _owner_pid(path: Path) -> int:
+    if REPLAYING_MARK in path.name:
+        return int(path.name.rsplit(REPLAYING_MARK, 1)[1])
+    return int(path.name.split("-", 1)[0])
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class ResultSink:
+
+    def __init__(
+            self,
+            writer: Optional[Writer] = None,
+            spool_dir: Optional[str] = None,
+            batch_size: Optional[int] = None,
+            flush_interval: Optional[float] = None,
+            flush_timeout: Optional[float] = None,
+            max_buffer_bytes: Optional[int] = None,
+    ):
+        self.writer = writer or insert_rows
+        self.spool_dir = Path(spool_dir or settings.RESULT_SPOOL_DIR)
+        self.batch_size = batch_size or settings.RESULT_BATCH_SIZE
+        self.flush_interval = flush_interval or settings.RESULT_FLUSH_INTERVAL
+        self.flush_timeout = flush_timeout or settings.RESULT_FLUSH_TIMEOUT
+        self.max_buffer_bytes = max_buffer_bytes or settings.RESULT_BUFFER_MAX_BYTES
+        self._summaries: List[dict] = []
+        self._details: List[dict] = []
+        self._buffered_bytes = 0
+        self._segment: Optional[Any] = None
+        self._segment_path: Optional[Path] = None
+        self._counter = itertools.count()
+        self._wakeup = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._segment_lock = asyncio.Lock()  # keeps the buffer and the open segment in step
+        self._flusher: Optional[asyncio.Task] = None
+        self._needs_replay = False
+        self.spilled = 0
+
+    # -------- Lifecycle --------
+
+    async def start(self) -> "ResultSink":
+        self.spool_dir.mkdir(parents=True, exist_ok=True)
+        await self.replay()
+        self._flusher = asyncio.create_task(self._flush_loop())
+        return self
+
+    async def close(self) -> None:
+        if self._flusher is not None:
+            self._flusher.cancel()
+            try:
+                await self._flusher
+            except asyncio.CancelledError:
+                pass
+            self._flusher = None
+        await self.flush()
+        await self.replay()
+
+    async def __aenter__(self) -> "ResultSink":
+        return await self.start()
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    # -------- Write Path --------
+
+    async def add(self, execution_id: int, result: CaseResult) -> None:
+        summary, detail, line = await asyncio.to_thread(_journal_entry, execution_id, result)
+        async with self._segment_lock:
+            if self._segment is None:
+                self._open_segment()
+            await asyncio.to_thread(self._append, line)
+            self._summaries.append(summary)
+            self._details.append(detail)
+            self._buffered_bytes += len(line)
+        if len(self._summaries) >= self.batch_size or self._buffered_bytes >= self.max_buffer_bytes:
+            self._wakeup.set()
+
+    def _append(self, line: bytes) -> None:
+        self._segment.write(line)
+        self._segment.flush()
+
+    def _open_segment(self) -> None:
+        name = f"{os.getpid()}-{next(self._counter):08d}-{os.urandom(4).hex()}"
+        self._segment_path = self.spool_dir / f"{name}{ACTIVE_SUFFIX}"
+        self._segment = open(self._segment_path, "ab")
+
+    def _seal_segment(self) -> Optional[Path]:
+        if self._segment is None:
+            return None
+        self._segment.close()
+        sealed = _sealed_path(self._segment_path)
+        os.replace(self._segment_path, sealed)
+        self._segment = self._segment_path = None
+        return sealed
+
+    async def _flush_loop(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+    async def flush(self) -> None:
+        async with self._flush_lock:
+            async with self._segment_lock:
+                if not self._summaries:
+                    return
+                summaries, self._summaries = self._summaries, []
+                details, self._details = self._details, []
+                self._buffered_bytes = 0
+                sealed = self._seal_segment()
+
+            try:
+                async with asyncio.timeout(self.flush_timeout):
+                    await self.writer(summaries, details)
+            except Exception as exc:
+                # The batch stays on disk in ``sealed`` and is replayed later.
+                self.spilled += len(summaries)
+                self._needs_replay = True
+                logger.warning("Result flush spilled to disk", rows=len(summaries), segment=str(sealed),
+                               error=f"{type(exc).__name__}: {exc}")
+                return
+            sealed.unlink(missing_ok=True)
+
+        if self._needs_replay:
+            # MySQL is keeping up again: drain what was spilled meanwhile.
+            self._needs_replay = False
+            await self.replay()
+
+    # -------- Recovery --------
+
+    def _recoverable_segments(self) -> List[Path]:
+        segments = sorted(self.spool_dir.glob(f"*{SEALED_SUFFIX}"))
+        orphans = [*self.spool_dir.glob(f"*{ACTIVE_SUFFIX}"), *self.spool_dir.glob(f"*{REPLAYING_MARK}*")]
+        for path in sorted(orphans):
+            if path != self._segment_path and not _pid_alive(_owner_pid(path)):
+                segments.append(path)
+        return segments
+
+    async def replay(self) -> int:
+        """Write spilled or orphaned segments to MySQL; returns rows replayed."""
+        replayed = 0
+        for segment in self._recoverable_segments():
+            claimed = segment.with_name(f"{segment.name.split('.', 1)[0]}{REPLAYING_MARK}{os.getpid()}")
+            try:
+                os.replace(segment, claimed)
+            except FileNotFoundError:
+                continue  # another process claimed it
+
+            rows = await asyncio.to_thread(_read_segment, claimed)
+            try:
+                for start in range(0, len(rows), self.batch_size):
+                    batch = rows[start:start + self.batch_size]
+                    async with asyncio.timeout(self.flush_timeout):
+                        await self.writer([s for s, _ in batch], [d for _, d in batch])
+            except Exception as exc:
+                if not _is_transient(exc):
+                    failed = claimed.with_name(claimed.name.split(".", 1)[0] + FAILED_SUFFIX)
+                    os.replace(claimed, failed)
+                    logger.error("Result segment rejected, quarantined", segment=str(failed), rows=len(rows),
+                                 error=f"{type(exc).__name__}: {exc}")
+                    continue
+                os.replace(claimed, _sealed_path(claimed))
+                self._needs_replay = True
+                logger.warning("Result replay deferred", segment=str(segment), error=str(exc))
+                break
+            claimed.unlink(missing_ok=True)
+            replayed += len(rows)
+        return replayed
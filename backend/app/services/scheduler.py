@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Sequence, Set
+
+from app.models.domain.execution import CaseOut
+from app.services.execution_engine import VARIABLE_PATTERN, CaseResult
+
+RunCase = Callable[[CaseOut, Dict[str, Any]], Awaitable[CaseResult]]
+RecordResult = Callable[[CaseResult], Awaitable[None]]
+
+
+def consumed_variables(case: CaseOut) -> Set[str]:
+    """Names referenced as ``{{name}}`` anywhere in the case's request."""
+    templates = [case.path, case.body or ""]
+    for pairs in (case.headers, case.params, case.form_data):
+        templates.extend(p.value for p in pairs)
+    return {name for text in templates if "{{" in text for name in VARIABLE_PATTERN.findall(text)}
+
+
+def produced_variables(case: CaseOut) -> Set[str]:
+    return {e.variable for e in case.extractors}
+
+
+@dataclass
+class CaseGraph:
+    """Dependency DAG between cases, indexed by position in the run.
+
+    A case depends on the nearest *preceding* case that extracts a variable
+    it consumes, so edges always point forward and the graph is acyclic.
+    Variables nobody extracts are left to the environment/parameters.
+    """
+
+    cases: List[CaseOut]
+    bindings: List[Dict[str, int]]
+    dependencies: List[Set[int]]
+    dependents: List[Set[int]]
+
+    @classmethod
+    def build(cls, cases: Sequence[CaseOut]) -> "CaseGraph":
+        cases = list(cases)
+        producers: Dict[str, int] = {}
+        bindings: List[Dict[str, int]] = []
+        dependencies: List[Set[int]] = []
+        dependents: List[Set[int]] = [set() for _ in cases]
+
+        for node, case in enumerate(cases):
+            binding = {var: producers[var] for var in consumed_variables(case) if var in producers}
+            bindings.append(binding)
+            dependencies.append(set(binding.values()))
+            for parent in dependencies[node]:
+                dependents[parent].add(node)
+            for var in produced_variables(case):
+                producers[var] = node
+
+        return cls(cases, bindings, dependencies, dependents)
+
+    def descendants(self, node: int) -> Set[int]:
+        seen: Set[int] = set()
+        stack = list(self.dependents[node])
+        while stack:
+            child = stack.pop()
+            if child not in seen:
+                seen.add(child)
+                stack.extend(self.dependents[child])
+        return seen
+
+
+@dataclass
+class ScheduleStats:
+    wall_ms: float = 0.0
+    critical_path_ms: float = 0.0
+    serial_ms: float = 0.0
+    skipped: int = 0
+    finish_ms: Dict[int, float] = field(default_factory=dict)
+
+
+class DagScheduler:
+    """Runs a :class:`CaseGraph` with at most ``concurrency`` cases in flight.
+
+    A case starts as soon as every case it depends on has succeeded; when a
+    case does not succeed only its descendants are skipped. The critical
+    path is the longest chain of case durations through the DAG, i.e. the
+    lower bound on wall time with unlimited concurrency.
+    """
+
+    def __init__(
+            self,
+            graph: CaseGraph,
+            run_case: RunCase,
+            record: RecordResult,
+            concurrency: int,
+            variables: Dict[str, Any],
+    ):
+        self.graph = graph
+        self.run_case = run_case
+        self.record = record
+        self.concurrency = max(1, concurrency)
+        self.variables = variables
+        # Only what dependents still need: the extracted values of producers.
+        self.extracted: Dict[int, Dict[str, Any]] = {}
+        self.stats = ScheduleStats()
+
+    def _variables_for(self, node: int) -> Dict[str, Any]:
+        binding = self.graph.bindings[node]
+        if not binding:
+            return self.variables
+        resolved = dict(self.variables)
+        for var, producer in binding.items():
+            resolved[var] = self.extracted[producer][var]
+        return resolved
+
+    def _skipped_result(self, node: int, upstream: CaseResult) -> CaseResult:
+        case = self.graph.cases[node]
+        return CaseResult(
+            case_id=case.id,
+            name=case.name,
+            module=case.module,
+            method=case.method.upper(),
+            url=case.path,
+            status="skipped",
+            error=f"Skipped: upstream case {upstream.case_id} ({upstream.name}) did not pass",
+            endpoint=f"{case.method.upper()} {case.path}",
+            seq=node,
+        )
+
+    async def run(self) -> ScheduleStats:
+        graph = self.graph
+        remaining = [len(deps) for deps in graph.dependencies]
+        ready: Deque[int] = deque(node for node, count in enumerate(remaining) if count == 0)
+        cancelled: Set[int] = set()
+        running: Dict[asyncio.Task, int] = {}
+        started = time.perf_counter()
+
+        try:
+            while ready or running:
+                while ready and len(running) < self.concurrency:
+                    node = ready.popleft()
+                    task = asyncio.create_task(self.run_case(graph.cases[node], self._variables_for(node)))
+                    running[task] = node
+
+                finished, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in finished:
+                    node = running.pop(task)
+                    result = task.result()
+                    result.seq = node
+                    if graph.dependents[node]:
+                        self.extracted[node] = result.extracted
+                    await self.record(result)
+
+                    self.stats.serial_ms += result.duration_ms
+                    upstream = max((self.stats.finish_ms[d] for d in graph.dependencies[node]), default=0.0)
+                    self.stats.finish_ms[node] = upstream + result.duration_ms
+
+                    if result.passed:
+                        for child in sorted(graph.dependents[node]):
+                            remaining[child] -= 1
+                            if remaining[child] == 0 and child not in cancelled:
+                                ready.append(child)
+                        continue
+
+                    for child in sorted(graph.descendants(node) - cancelled):
+                        cancelled.add(child)
+                        self.stats.skipped += 1
+                        await self.record(self._skipped_result(child, result))
+        finally:
+            for task in running:
+                task.cancel()
+            # Let cancelled cases unwind before the caller closes their HTTP client.
+            await asyncio.gather(*running, return_exceptions=True)
+
+        self.stats.wall_ms = (time.perf_counter() - started) * 1000
+        self.stats.critical_path_ms = max(self.stats.finish_ms.values(), default=0.0)
+        return self.stats
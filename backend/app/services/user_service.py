@@ -1,15 +1,21 @@
-from typing import List
+from typing import List, Optional
+
+from redis.asyncio import Redis
+
 from app.repositories.user_repo import UserRepository
 from app.models.domain.user import UserCreate
 from app.models.domain.user import UserOut
+from app.services.auth_service import invalidate_principal
 
 
 class UserService:
-    def __init__(self, repo: UserRepository):
+    def __init__(self, repo: UserRepository, redis: Optional[Redis] = None):
         self.repo = repo
+        self.redis = redis
 
     async def create_user(self, data: UserCreate) -> UserOut:
         user = await self.repo.create(data)
+        await invalidate_principal(self.redis, user.email)
         return user
 
     async def list_users(self) -> List[UserOut]:
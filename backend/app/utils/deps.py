@@ -1,18 +1,82 @@
-from typing import AsyncGenerator
+from typing import AsyncGenerator, Optional
 
 from fastapi import Depends
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from redis.asyncio import Redis
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.cache import get_redis, get_redis_client
 from app.core.database import AsyncSessionLocal
+from app.core.exception import UnauthorizedException
+from app.core.security import decode_access_token
+from app.models.domain.user import UserOut
+from app.repositories.case_repo import CaseRepository
+from app.repositories.environment_repo import EnvironmentRepository
+from app.repositories.execution_repo import ExecutionRepository
+from app.repositories.report_repo import ReportRepository
+from app.repositories.result_repo import ResultRepository
 from app.repositories.user_repo import UserRepository
+from app.services.auth_service import AuthService
+from app.services.dataset import DatasetStore
+from app.services.execution_service import ExecutionService
+from app.services.load_test import LoadTestService
+from app.services.report_service import ReportService
 from app.services.user_service import UserService
 
+bearer_scheme = HTTPBearer(auto_error=False)
+
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     async with AsyncSessionLocal() as session:
         yield session
 
 
-def get_user_service(db=Depends(get_db)):
+def get_optional_redis() -> Optional[Redis]:
+    # 用户接口不依赖 Redis：未初始化时跳过缓存失效
+    try:
+        return get_redis_client()
+    except RuntimeError:
+        return None
+
+
+def get_user_service(db=Depends(get_db), redis: Optional[Redis] = Depends(get_optional_redis)):
+    repo = UserRepository(db)
+    return UserService(repo, redis)
+
+
+def get_auth_service(db=Depends(get_db), redis: Redis = Depends(get_redis)):
     repo = UserRepository(db)
-    return UserService(repo)
+    return AuthService(repo, redis)
+
+
+def get_execution_service(db=Depends(get_db), redis: Redis = Depends(get_redis)):
+    return ExecutionService(
+        ExecutionRepository(db),
+        CaseRepository(db),
+        EnvironmentRepository(db),
+        ReportRepository(db),
+        ResultRepository(db),
+        redis,
+    )
+
+
+def get_report_service(db=Depends(get_db), redis: Redis = Depends(get_redis)):
+    return ReportService(ReportRepository(db), redis)
+
+
+def get_dataset_store():
+    return DatasetStore()
+
+
+def get_load_test_service(db=Depends(get_db), redis: Redis = Depends(get_redis)):
+    return LoadTestService(CaseRepository(db), EnvironmentRepository(db), redis)
+
+
+async def get_current_user(
+        credentials: Optional[HTTPAuthorizationCredentials] = Depends(bearer_scheme),
+        service: AuthService = Depends(get_auth_service),
+) -> UserOut:
+    if credentials is None:
+        raise UnauthorizedException("Not authenticated")
+    claims = decode_access_token(credentials.credentials)
+    return await service.get_principal(claims["sub"])
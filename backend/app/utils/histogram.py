@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+HDR-style latency histogram.
+
+Values are recorded in integer microseconds into log-linear buckets: every
+power-of-two range is split into ``SUB_BUCKETS / 2`` equal slots, which
+keeps the relative error of any reported value below 1% across the whole
+range while using a few KiB at most. Counts are stored sparsely so
+histograms serialise to small JSON and merge by adding counts.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Any, Dict, Iterable, Optional
+
+SUB_BUCKET_BITS = 8
+SUB_BUCKETS = 1 << SUB_BUCKET_BITS  # 256 -> < 1% relative error
+HALF_SUB_BUCKETS = SUB_BUCKETS >> 1
+
+
+def bucket_index(value: int) -> int:
+    if value < SUB_BUCKETS:
+        return value
+    shift = value.bit_length() - SUB_BUCKET_BITS
+    return SUB_BUCKETS + (shift - 1) * HALF_SUB_BUCKETS + (value >> shift) - HALF_SUB_BUCKETS
+
+
+def bucket_bounds(index: int) -> tuple[int, int]:
+    """Inclusive ``(lowest, highest)`` values that map to ``index``."""
+    if index < SUB_BUCKETS:
+        return index, index
+    shift, offset = divmod(index - SUB_BUCKETS, HALF_SUB_BUCKETS)
+    shift += 1
+    lowest = (offset + HALF_SUB_BUCKETS) << shift
+    return lowest, lowest + (1 << shift) - 1
+
+
+class LatencyHistogram:
+
+    def __init__(self) -> None:
+        self.counts: Dict[int, int] = {}
+        self.total = 0
+        self.sum = 0
+        self.min: Optional[int] = None
+        self.max: Optional[int] = None
+
+    # -------- Recording --------
+
+    def record(self, value_us: float, count: int = 1) -> None:
+        value = max(0, int(value_us))
+        index = bucket_index(value)
+        self.counts[index] = self.counts.get(index, 0) + count
+        self.total += count
+        self.sum += value * count
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def record_ms(self, value_ms: float) -> None:
+        self.record(value_ms * 1000)
+
+    def merge(self, other: "LatencyHistogram") -> "LatencyHistogram":
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.total += other.total
+        self.sum += other.sum
+        if other.min is not None:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+        if other.max is not None:
+            self.max = other.max if self.max is None else max(self.max, other.max)
+        return self
+
+    @classmethod
+    def merged(cls, histograms: Iterable["LatencyHistogram"]) -> "LatencyHistogram":
+        result = cls()
+        for histogram in histograms:
+            result.merge(histogram)
+        return result
+
+    # -------- Queries --------
+
+    @property
+    def mean(self) -> float:
+        return self.sum / self.total if self.total else 0.0
+
+    def percentile(self, p: float) -> int:
+        """Value at percentile ``p`` (0-100), reported as the bucket's highest value."""
+        if not self.total:
+            return 0
+        rank = max(1, math.ceil(self.total * p / 100))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                high = bucket_bounds(index)[1]
+                return high if self.max is None else min(high, self.max)
+        return self.max or 0
+
+    def summary(self) -> Dict[str, Any]:
+        """Percentiles in milliseconds, as consumed by reports and the UI."""
+        to_ms = lambda us: round(us / 1000, 3)
+        return {
+            "count": self.total,
+            "min_ms": to_ms(self.min or 0),
+            "mean_ms": to_ms(self.mean),
+            "p50_ms": to_ms(self.percentile(50)),
+            "p90_ms": to_ms(self.percentile(90)),
+            "p99_ms": to_ms(self.percentile(99)),
+            "p999_ms": to_ms(self.percentile(99.9)),
+            "max_ms": to_ms(self.max or 0),
+        }
+
+    # -------- Serialisation --------
+
+    @classmethod
+    def from_counts(cls, counts: Dict[int, int], total_sum: int = 0) -> "LatencyHistogram":
+        """Rebuild from bucket counts alone (min/max become bucket bounds)."""
+        histogram = cls()
+        histogram.counts = {index: count for index, count in counts.items() if count}
+        histogram.total = sum(histogram.counts.values())
+        histogram.sum = total_sum
+        if histogram.counts:
+            histogram.min = bucket_bounds(min(histogram.counts))[0]
+            histogram.max = bucket_bounds(max(histogram.counts))[1]
+        return histogram
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "counts": {str(index): count for index, count in self.counts.items()},
+            "total": self.total,
+            "sum": self.sum,
+            "min": self.min,
+            "max": self.max,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "LatencyHistogram":
+        histogram = cls()
+        histogram.counts = {int(index): int(count) for index, count in data.get("counts", {}).items()}
+        histogram.total = int(data.get("total", 0))
+        histogram.sum = int(data.get("sum", 0))
+        histogram.min = data.get("min")
+        histogram.max = data.get("max")
+        return histogram
@@ -8,8 +8,23 @@
 
 import json
 import asyncio
+import time
+from celery import chord
 from redis.asyncio import Redis
+from app.core.cache import init_redis, close_redis, get_redis_client
 from app.core.celery_app import celery_app
+from app.core.database import AsyncSessionLocal, close_db
+from app.repositories.case_repo import CaseRepository
+from app.repositories.environment_repo import EnvironmentRepository
+from app.repositories.execution_repo import ExecutionRepository
+from app.repositories.report_repo import ReportRepository
+from app.repositories.result_repo import ResultRepository
+from app.models.domain.load_test import LoadTestCreate
+from app.services.execution_service import ExecutionService
+from app.services.load_test import LoadTestService
+
+# 所有压测 worker 在同一时刻开始，留出 worker 启动的时间
+LOAD_TEST_START_DELAY = 2.0
 
 
 async def _async_publish(channel: str, message: dict):
@@ -21,3 +36,89 @@ async def _async_publish(channel: str, message: dict):
 @celery_app.task(name="app.workers.tasks.send_event")
 def send_event(channel: str, data: dict):
     asyncio.run(_async_publish(channel, data))
+
+
+async def _async_run_execution(execution_id: int):
+    await init_redis()
+    try:
+        async with AsyncSessionLocal() as db:
+            service = ExecutionService(
+                ExecutionRepository(db),
+                CaseRepository(db),
+                EnvironmentRepository(db),
+                ReportRepository(db),
+                ResultRepository(db),
+                get_redis_client(),
+            )
+            summary = await service.run(execution_id)
+            return summary.to_dict()
+    finally:
+        await close_redis()
+        # 连接池绑定在本次 asyncio.run 的事件循环上，任务结束时释放
+        await close_db()
+
+
+@celery_app.task(name="app.workers.tasks.run_execution")
+def run_execution(execution_id: int):
+    return asyncio.run(_async_run_execution(execution_id))
+
+
+async def _async_run_load_test_worker(load_test_id: str, config: dict, worker_index: int, start_at: float):
+    await init_redis()
+    try:
+        async with AsyncSessionLocal() as db:
+            service = LoadTestService(CaseRepository(db), EnvironmentRepository(db), get_redis_client())
+            return await service.run_worker(load_test_id, LoadTestCreate(**config), worker_index, start_at)
+    finally:
+        await close_redis()
+        await close_db()
+
+
+async def _async_finish_load_test(results: list, load_test_id: str):
+    await init_redis()
+    try:
+        async with AsyncSessionLocal() as db:
+            service = LoadTestService(CaseRepository(db), EnvironmentRepository(db), get_redis_client())
+            return await service.finish(load_test_id, results)
+    finally:
+        await close_redis()
+        await close_db()
+
+
+@celery_app.task(name="app.workers.tasks.run_load_test_worker")
+def run_load_test_worker(load_test_id: str, config: dict, worker_index: int, start_at: float):
+    return asyncio.run(_async_run_load_test_worker(load_test_id, config, worker_index, start_at))
+
+
+@celery_app.task(name="app.workers.tasks.finish_load_test")
+def finish_load_test(results: list, load_test_id: str):
+    return asyncio.run(_async_finish_load_test(results, load_test_id))
+
+
+async def _async_fail_load_test(load_test_id: str, error: str):
+    await init_redis()
+    try:
+        async with AsyncSessionLocal() as db:
+            service = LoadTestService(CaseRepository(db), EnvironmentRepository(db), get_redis_client())
+            await service.fail(load_test_id, error)
+    finally:
+        await close_redis()
+        await close_db()
+
+
+@celery_app.task(name="app.workers.tasks.fail_load_test")
+def fail_load_test(request, exc, traceback, load_test_id: str):
+    # chord 中任一 worker 失败时 finish_load_test 不会执行，由此回调把记录标记为 error
+    asyncio.run(_async_fail_load_test(load_test_id, f"{type(exc).__name__}: {exc}"))
+
+
+def dispatch_load_test(load_test_id: str, config: LoadTestCreate):
+    """Fan the load test out to ``config.workers`` Celery workers and merge their histograms."""
+    payload = config.model_dump(mode="json")
+    start_at = time.time() + LOAD_TEST_START_DELAY
+    workers = [
+        run_load_test_worker.s(load_test_id, payload, index, start_at)
+        for index in range(config.workers)
+    ]
+    body = finish_load_test.s(load_test_id).on_error(fail_load_test.s(load_test_id))
+    return chord(workers)(body)
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Microbenchmarks for app.services.extraction.
+
+    python -m benchmarks.bench_extraction
+"""
+
+import json
+import re
+import timeit
+
+from app.models.domain.execution import CaseOut
+from app.services.extraction import JsonPath, compile_case, evaluate_batch
+
+SMALL_BODY = json.dumps({
+    "code": 0,
+    "data": {"token": "abc", "user": {"id": 42, "roles": ["admin", "dev"]}},
+}).encode()
+
+LARGE_BODY = json.dumps({
+    "meta": {"total": 50000},
+    "items": [{"id": i, "name": f"item-{i}", "tags": ["x", "y"]} for i in range(50000)],
+    "token": "tail",
+}).encode()
+
+CASE = CaseOut(
+    id=1, name="bench", method="GET", path="/",
+    assertions={
+        "statusCode": "200",
+        "body": [
+            {"jsonpath": "$.code", "operator": "equals", "expected": "0"},
+            {"jsonpath": "$.data.user.id", "operator": "greater", "expected": "1"},
+            {"jsonpath": "$.data.user.roles", "operator": "contains", "expected": "admin"},
+        ],
+    },
+    extractors=[
+        {"variable": "token", "expression": "$.data.token"},
+        {"variable": "user_id", "expression": "$.data.user.id"},
+        {"variable": "trace", "source": "response_header", "extract_type": "regex", "expression": r"x-trace: (\w+)"},
+    ],
+)
+HEADERS = {"content-type": "application/json", "x-trace": "t123"}
+
+
+def naive_evaluate(body: bytes) -> None:
+    """Reparse the body and recompile every expression per rule, as a baseline."""
+    for expression in ("$.code", "$.data.user.id", "$.data.user.roles", "$.data.token", "$.data.user.id"):
+        JsonPath(expression).resolve(json.loads(body))
+    re.compile(r"x-trace: (\w+)", re.UNICODE).search("\n".join(f"{k}: {v}" for k, v in HEADERS.items()))
+
+
+def report(name: str, seconds: float, number: int) -> None:
+    print(f"{name:<40} {seconds / number * 1e6:10.2f} us/op")
+
+
+def main() -> None:
+    compiled = compile_case(CASE)
+    number = 20000
+    report("naive (reparse + recompile)", timeit.timeit(lambda: naive_evaluate(SMALL_BODY), number=number), number)
+    report("compiled case, shared body", timeit.timeit(
+        lambda: compiled.evaluate(200, HEADERS, SMALL_BODY), number=number), number)
+
+    batch = [(200, HEADERS, SMALL_BODY)] * 1000
+    report("evaluate_batch x1000 (per response)", timeit.timeit(
+        lambda: evaluate_batch(compiled, batch), number=20), 20 * len(batch))
+
+    number = 20
+    text = LARGE_BODY.decode()
+    head, tail = JsonPath("$.meta.total"), JsonPath("$.token")
+    print(f"\nlarge body: {len(LARGE_BODY) / 1024 / 1024:.1f} MiB")
+    report("full parse, $.meta.total", timeit.timeit(lambda: head.resolve(json.loads(LARGE_BODY)), number=number), number)
+    report("stream, $.meta.total", timeit.timeit(lambda: head.stream(text), number=number), number)
+    report("full parse, $.token (last key)", timeit.timeit(lambda: tail.resolve(json.loads(LARGE_BODY)), number=number), number)
+    report("stream, $.token (last key)", timeit.timeit(lambda: tail.stream(text), number=number), number)
+
+
+if __name__ == "__main__":
+    main()
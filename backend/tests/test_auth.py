@@ -0,0 +1,114 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+from fastapi.security import HTTPAuthorizationCredentials
+from jose import jwt
+from redis.exceptions import ConnectionError
+
+from app.core.config import settings
+from app.core.exception import UnauthorizedException
+from app.core.security import TokenCache, create_access_token, decode_access_token, token_cache
+from app.models.domain.user import UserCreate
+from app.services.auth_service import AuthService
+from app.services.user_service import UserService
+from app.utils.deps import get_current_user
+
+
+class MemoryCache:
+    def __init__(self):
+        self.values = {}
+        self.down = False
+
+    def _check(self):
+        if self.down:
+            raise ConnectionError("redis is down")
+
+    async def get(self, key):
+        self._check()
+        return self.values.get(key)
+
+    async def set(self, key, value, ex=None):
+        self._check()
+        self.values[key] = value
+
+    async def delete(self, key):
+        self._check()
+        self.values.pop(key, None)
+
+
+class Users:
+    def __init__(self):
+        self.rows = {}
+        self.lookups = 0
+
+    async def get_by_email(self, email):
+        self.lookups += 1
+        return self.rows.get(email)
+
+    async def create(self, data):
+        row = self.rows[data.email] = SimpleNamespace(id=len(self.rows) + 1, name=data.name, email=data.email)
+        return row
+
+
+def test_decode_access_token_caches_claims():
+    token_cache.clear()
+    token = create_access_token("alice@example.com")
+    claims = decode_access_token(token)
+    assert claims["sub"] == "alice@example.com"
+    assert len(token_cache) == 1
+    assert decode_access_token(token) is claims
+
+
+def test_decode_access_token_rejects_bad_tokens():
+    with pytest.raises(UnauthorizedException):
+        decode_access_token("not-a-token")
+
+    expired = jwt.encode(
+        {"sub": "bob@example.com", "exp": int(time.time()) - 10},
+        settings.JWT_SECRET,
+        algorithm=settings.JWT_ALGORITHM,
+    )
+    with pytest.raises(UnauthorizedException):
+        decode_access_token(expired)
+
+
+def test_token_cache_honours_expiry_and_bound():
+    cache = TokenCache(maxsize=2)
+    cache.put("a", {"sub": "a", "exp": time.time() + 60})
+    cache.put("b", {"sub": "b", "exp": time.time() - 1})
+    assert cache.get("b") is None
+
+    cache.put("c", {"sub": "c", "exp": time.time() + 60})
+    cache.put("d", {"sub": "d", "exp": time.time() + 60})
+    assert len(cache) == 2
+    assert cache.get("a") is None
+    assert cache.get("d")["sub"] == "d"
+
+
+def test_principal_is_cached_invalidated_and_survives_a_redis_outage():
+    redis, users = MemoryCache(), Users()
+    auth = AuthService(users, redis)
+    token = create_access_token("carol@example.com")
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+    async def scenario():
+        with pytest.raises(UnauthorizedException):
+            await auth.get_principal("carol@example.com")
+        await UserService(users, redis).create_user(UserCreate(name="Carol", email="carol@example.com"))
+
+        assert (await get_current_user(credentials, auth)).name == "Carol"  # miss, then cached
+        assert (await get_current_user(credentials, auth)).name == "Carol"
+        assert users.lookups == 2
+
+        users.rows["carol@example.com"].name = "Caroline"
+        await UserService(users, redis).create_user(UserCreate(name="Caroline", email="carol@example.com"))
+        assert (await auth.get_principal("carol@example.com")).name == "Caroline"
+        assert users.lookups == 3
+
+        redis.down = True
+        await UserService(users, redis).create_user(UserCreate(name="Dave", email="dave@example.com"))
+        assert (await auth.get_principal("dave@example.com")).name == "Dave"
+
+    asyncio.run(scenario())
@@ -0,0 +1,125 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from app.core.exception import BusinessException, NotFoundException
+from app.models.domain.execution import CaseOut, EnvironmentOut
+from app.services.dataset import DatasetStore, describe, iter_chunks, iter_rows
+from app.services.execution_engine import ClientPool, ExecutionEngine
+
+ENVIRONMENT = EnvironmentOut(id=1, name="test", base_url="http://api.test")
+
+
+def test_csv_rows_stream_with_bom_and_quoted_newlines(tmp_path):
+    path = tmp_path / "users.csv"
+    path.write_text('﻿name,note\nalice,"line1\nline2"\n\nbob,x\ncarol,y\n', encoding="utf-8")
+
+    rows = list(iter_rows(path))
+
+    assert [r.index for r in rows] == [0, 1, 2]
+    assert rows[0].values == {"name": "alice", "note": "line1\nline2"}
+    assert [r.values["name"] for r in iter_rows(path, indexes={2, 0})] == ["alice", "carol"]
+    assert describe(path).columns == ["name", "note"]
+
+
+def test_ndjson_rows_are_chunked_and_selected_by_index(tmp_path):
+    path = tmp_path / "ids.ndjson"
+    path.write_bytes(b"".join(json.dumps({"id": i}).encode() + b"\n" for i in range(10)) + b"[1]\n")
+
+    assert [len(c) for c in iter_chunks(path, chunk_rows=4)] == [4, 4, 3]
+    assert [r.values["id"] for r in iter_rows(path, indexes=[7, 3])] == [3, 7]
+    assert list(iter_rows(path, indexes=[10]))[0].error == "Dataset row 10 is not a JSON object"
+    assert describe(path).rows == 11
+    with pytest.raises(BusinessException):
+        describe(path, strict=True)
+
+
+def test_store_streams_upload_to_disk_and_rejects_unknown_ids(tmp_path):
+    store = DatasetStore(str(tmp_path), max_bytes=1024)
+
+    async def body(*parts):
+        for part in parts:
+            yield part
+
+    info = asyncio.run(store.save("../Users 2024.csv", body(b"id,name\n1,", b"a\n2,b\n")))
+    assert info.id.endswith("-Users_2024.csv") and info.rows == 2
+    assert store.path(info.id).read_bytes() == b"id,name\n1,a\n2,b\n"
+
+    with pytest.raises(BusinessException):
+        asyncio.run(store.save("big.csv", body(b"x" * 2048)))
+    with pytest.raises(BusinessException, match="UTF-8"):
+        asyncio.run(store.save("latin.csv", body(b"name\n\xe9t\xe9\n")))
+    with pytest.raises(NotFoundException):
+        store.path("../" + info.id)
+    assert [p.name for p in tmp_path.iterdir()] == [info.id]
+
+
+def test_engine_runs_one_request_per_row_with_bounded_read_ahead(tmp_path):
+    path = tmp_path / "orders.ndjson"
+    with open(path, "wb") as f:
+        for i in range(2000):
+            f.write(b"not json\n" if i == 1500 else json.dumps({"order": i}).encode() + b"\n")
+
+    produced = 0
+    recorded = []
+    read_ahead = []
+
+    def counted(chunks):
+        nonlocal produced
+        for chunk in chunks:
+            produced += len(chunk)
+            yield chunk
+
+    async def on_result(result):
+        recorded.append(result)
+        read_ahead.append(produced - len(recorded))
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(0)
+        order = int(request.url.path.rsplit("/", 1)[1])
+        return httpx.Response(200 if order % 100 else 500)
+
+    case = CaseOut(id=1, name="order", method="GET", path="/orders/{{order}}",
+                   assertions={"statusCode": "200"})
+
+    async def scenario():
+        async with ClientPool(transport=httpx.MockTransport(handler)) as pool:
+            engine = ExecutionEngine(1, ENVIRONMENT, pool, concurrency=8, on_result=on_result)
+            return await engine.run_dataset(case, counted(iter_chunks(path, chunk_rows=50)), 2000)
+
+    summary = asyncio.run(scenario())
+
+    assert (summary.passed, summary.failed, summary.errors) == (1980, 19, 1)
+    assert sorted(r.seq for r in recorded) == list(range(2000))
+    assert next(r for r in recorded if r.status == "error").seq == 1500
+    assert max(read_ahead) <= 50 + 3 * 8
+
+
+def test_engine_crash_awaits_in_flight_rows(tmp_path):
+    path = tmp_path / "rows.ndjson"
+    path.write_bytes(b"".join(json.dumps({"n": i}).encode() + b"\n" for i in range(4)))
+    unwound = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        try:
+            await asyncio.sleep(0 if request.url.path == "/r/0" else 10)
+        finally:
+            unwound.append(request.url.path)
+        return httpx.Response(200)
+
+    async def on_result(result):
+        raise RuntimeError("sink down")
+
+    case = CaseOut(id=1, name="row", method="GET", path="/r/{{n}}")
+
+    async def scenario():
+        async with ClientPool(transport=httpx.MockTransport(handler)) as pool:
+            engine = ExecutionEngine(1, ENVIRONMENT, pool, concurrency=4, on_result=on_result)
+            try:
+                await engine.run_dataset(case, iter_chunks(path), 4)
+            except RuntimeError:
+                return sorted(unwound)
+
+    assert asyncio.run(scenario()) == ["/r/0", "/r/1", "/r/2", "/r/3"]
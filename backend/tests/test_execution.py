@@ -0,0 +1,88 @@
+import asyncio
+import json
+
+import httpx
+
+from app.models.domain.execution import CaseOut, EnvironmentOut
+from app.services.execution_engine import ClientPool, ExecutionEngine, render
+
+ENVIRONMENT = EnvironmentOut(id=1, name="test", base_url="http://api.test", variables={"token": "abc"})
+
+
+def make_case(case_id: int, path: str = "/ping", **kwargs) -> CaseOut:
+    return CaseOut(id=case_id, name=f"case {case_id}", method="GET", path=path, **kwargs)
+
+
+def run_engine(handler, cases, **kwargs):
+    async def scenario():
+        async with ClientPool(transport=httpx.MockTransport(handler)) as pool:
+            engine = ExecutionEngine(1, ENVIRONMENT, pool, **kwargs)
+            return await engine.run(cases)
+
+    return asyncio.run(scenario())
+
+
+def test_render_substitutes_known_variables_only():
+    assert render("/users/{{ id }}?t={{token}}&x={{missing}}", {"id": 7, "token": "abc"}) == \
+        "/users/7?t=abc&x={{missing}}"
+
+
+def test_engine_limits_concurrency_and_checks_assertions():
+    in_flight = 0
+    peak = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        assert request.headers["Authorization"] == "Bearer abc"
+        return httpx.Response(200, json={"code": 0, "data": {"items": [1, 2, 3]}})
+
+    cases = [
+        make_case(
+            i,
+            headers=[{"key": "Authorization", "value": "Bearer {{token}}"}],
+            assertions={
+                "statusCode": "200",
+                "body": [{"jsonpath": "$.data.items[2]", "operator": "equals", "expected": "3" if i % 2 else "4"}],
+            },
+        )
+        for i in range(20)
+    ]
+    summary = run_engine(handler, cases, concurrency=4)
+
+    assert peak <= 4
+    assert summary.total == 20
+    assert summary.passed == 10
+    assert summary.failed == 10
+
+
+def test_engine_enforces_request_timeout():
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(1)
+        return httpx.Response(200, content=json.dumps({}).encode())
+
+    summary = run_engine(handler, [make_case(1)], timeout=0.05)
+    assert summary.errors == 1
+
+
+def test_invalid_regex_fails_its_case_only():
+    results = {}
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json={"code": 0})
+
+    async def collect(result):
+        results[result.case_id] = result
+
+    cases = [
+        make_case(1, extractors=[{"variable": "x", "extract_type": "regex", "expression": "(unclosed"}]),
+        make_case(2, assertions={"statusCode": "200"}),
+    ]
+    summary = run_engine(handler, cases, on_result=collect)
+
+    assert summary.errors == 1 and summary.passed == 1
+    assert results[1].error.startswith("Invalid expression: Invalid regex")
+    assert results[2].status_code == 200
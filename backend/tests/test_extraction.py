@@ -0,0 +1,94 @@
+import json
+
+import pytest
+
+from app.models.domain.execution import CaseOut
+from app.services.extraction import (
+    JsonPath,
+    ResponseView,
+    compile_case,
+    compile_jsonpath,
+    compile_regex,
+    evaluate_batch,
+)
+
+DOCUMENT = {
+    "code": 0,
+    "data": {
+        "token": "t-1",
+        "items": [{"id": 1, "tags": ["a"]}, {"id": 2, "tags": ["b", "c"]}],
+        "note": "brackets ] } and \"quotes\" inside",
+    },
+}
+BODY = json.dumps(DOCUMENT).encode()
+
+
+def test_jsonpath_resolves_simple_and_wildcard_paths():
+    assert JsonPath("$.data.items[1].id").resolve(DOCUMENT) == 2
+    assert JsonPath("$['data']['token']").resolve(DOCUMENT) == "t-1"
+    assert JsonPath("$.data.items[-1].tags[0]").resolve(DOCUMENT) == "b"
+    assert JsonPath("$.data.items[*].id").resolve(DOCUMENT) == [1, 2]
+    assert JsonPath("$..id").resolve(DOCUMENT) == [1, 2]
+    with pytest.raises(LookupError):
+        JsonPath("$.data.missing").resolve(DOCUMENT)
+    with pytest.raises(ValueError):
+        JsonPath("data.token")
+
+
+def test_compiled_expressions_are_cached():
+    assert compile_jsonpath("$.data.token") is compile_jsonpath("$.data.token")
+
+
+def test_invalid_regex_raises_value_error():
+    with pytest.raises(ValueError, match="Invalid regex"):
+        compile_regex("(unclosed")
+
+
+@pytest.mark.parametrize("path", ["$.code", "$.data.token", "$.data.items[1].tags[1]", "$.data.note"])
+def test_streaming_matches_full_parse(path):
+    compiled = JsonPath(path)
+    assert compiled.stream(BODY.decode()) == compiled.resolve(DOCUMENT)
+
+
+def test_response_is_parsed_once_and_streamed_when_large():
+    view = ResponseView(200, {}, BODY, streaming_threshold=0)
+    assert view.select(compile_jsonpath("$.data.token")) == "t-1"
+    assert "document" not in view.__dict__
+    assert view.select(compile_jsonpath("$.data.items[1].id")) == 2
+    document = view.document
+    assert view.select(compile_jsonpath("$.code")) == 0
+    assert view.document is document
+
+    view = ResponseView(200, {}, BODY, streaming_threshold=len(BODY))
+    view.select(compile_jsonpath("$.code"))
+    document = view.document
+    view.select(compile_jsonpath("$.data.token"))
+    assert view.document is document
+
+
+def test_compiled_case_evaluates_assertions_and_extractors():
+    case = CaseOut(
+        id=1, name="login", method="POST", path="/login",
+        assertions={
+            "statusCode": "200",
+            "body": [
+                {"jsonpath": "$.code", "operator": "equals", "expected": "0"},
+                {"jsonpath": "$.data.items", "operator": "contains", "expected": "x"},
+                {"jsonpath": "$.data.items[1].id", "operator": "greater", "expected": "1"},
+            ],
+        },
+        extractors=[
+            {"variable": "token", "expression": "$.data.token"},
+            {"variable": "trace", "source": "response_header", "extract_type": "regex",
+             "expression": r"x-trace: (\w+)"},
+            {"variable": "absent", "expression": "$.nope"},
+        ],
+    )
+    compiled = compile_case(case)
+    [evaluation, second] = evaluate_batch(compiled, [(200, {"x-trace": "abc"}, BODY)] * 2)
+
+    assert [a["result"] for a in evaluation.assertions] == [True, True, False, True]
+    assert evaluation.extracted == {"token": "t-1", "trace": "abc"}
+    assert evaluation.missing == ["absent"]
+    assert not evaluation.passed
+    assert second.extracted == evaluation.extracted
@@ -0,0 +1,71 @@
+import asyncio
+import random
+import time
+
+import httpx
+
+from app.models.domain.execution import CaseOut, EnvironmentOut
+from app.services.execution_engine import ClientPool, ExecutionEngine
+from app.services.load_test import OpenModelRunner, arrival_offset, merge_results
+from app.utils.histogram import LatencyHistogram, bucket_bounds, bucket_index
+
+ENVIRONMENT = EnvironmentOut(id=1, name="test", base_url="http://api.test")
+CASE = CaseOut(id=1, name="ping", method="GET", path="/ping")
+
+
+def test_histogram_buckets_keep_relative_error_below_one_percent():
+    for value in [0, 1, 255, 256, 257, 1000, 12345, 999_999, 3_600_000_000]:
+        low, high = bucket_bounds(bucket_index(value))
+        assert low <= value <= high
+        assert high - low <= max(1, value // 100)
+
+
+def test_histogram_percentiles_and_merge():
+    values = [random.randint(1_000, 100_000) for _ in range(10_000)]
+    first, second = LatencyHistogram(), LatencyHistogram()
+    for i, value in enumerate(values):
+        (first if i % 2 else second).record(value)
+
+    merged = LatencyHistogram.from_dict(first.to_dict()).merge(LatencyHistogram.from_dict(second.to_dict()))
+    exact_p99 = sorted(values)[int(len(values) * 0.99) - 1]
+    assert merged.total == len(values)
+    assert abs(merged.percentile(99) - exact_p99) <= exact_p99 * 0.01
+    assert merged.max == max(values)
+
+
+def test_arrival_schedule_ramps_then_holds_rate():
+    assert arrival_offset(0, rate=100) == 0
+    assert arrival_offset(100, rate=100) == 1.0
+    # Ramping to 100/s over 2s spreads the first 100 arrivals over the ramp.
+    assert abs(arrival_offset(100, rate=100, ramp_up=2) - 2.0) < 1e-9
+    assert arrival_offset(50, rate=100, ramp_up=2) > 1.0
+    assert abs(arrival_offset(200, rate=100, ramp_up=2) - 3.0) < 1e-9
+
+
+def test_open_model_latency_counts_time_spent_behind_a_stall():
+    stalled = False
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal stalled
+        if not stalled:
+            stalled = True
+            time.sleep(0.2)  # freezes the client loop, like a GC pause or a saturated worker
+        return httpx.Response(200)
+
+    async def scenario():
+        async with ClientPool(transport=httpx.MockTransport(handler)) as pool:
+            engine = ExecutionEngine("lt", ENVIRONMENT, pool)
+            runners = [
+                OpenModelRunner(engine, [CASE], rate=200, duration=0.3, worker_index=w, workers=2)
+                for w in range(2)
+            ]
+            return await asyncio.gather(*(r.run() for r in runners))
+
+    report = merge_results(r.to_dict() for r in asyncio.run(scenario()))
+
+    assert report["scheduled"] == 60
+    assert report["completed"] == 60
+    # Arrivals due during the stall are sent late; measured from their
+    # intended start they carry that delay even though the server was fast.
+    assert report["latency"]["p90_ms"] > 100
+    assert report["service_time"]["p90_ms"] < 20
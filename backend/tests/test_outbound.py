@@ -0,0 +1,173 @@
+import asyncio
+import os
+import time
+
+import httpx
+import pytest
+from redis.asyncio import Redis
+
+from app.models.domain.execution import CaseOut, EnvironmentOut, OutboundPolicy
+from app.services.execution_engine import ClientPool, ExecutionEngine
+from app.services.outbound import AdaptiveLimiter, CircuitBreaker, HostGuard, OutboundControl
+
+REDIS_URL = os.getenv("REDIS_TEST_URL")
+
+
+class Clock:
+    now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class MemoryFlags:
+    """Just the two commands a guard issues when no rate limit is configured."""
+
+    def __init__(self):
+        self.values = {}
+
+    async def pttl(self, key):
+        return -2 if key not in self.values else 10_000
+
+    async def set(self, key, value, px=None):
+        self.values[key] = value
+
+
+def test_breaker_opens_on_error_rate_and_probes_once_after_cooldown():
+    clock = Clock()
+    breaker = CircuitBreaker(window=10, min_requests=10, error_rate=0.5, cooldown=5, clock=clock)
+
+    tripped = [breaker.record(ok) for ok in [True, False] * 5]
+    assert tripped[-1] and breaker.state == "open"
+    assert not breaker.allow()
+
+    clock.now = 5
+    assert breaker.allow() and not breaker.allow()
+    assert breaker.record(False)
+    clock.now = 10
+    assert breaker.allow()
+    assert not breaker.record(True)
+    assert breaker.state == "closed" and breaker.allow()
+
+
+def test_limiter_backs_off_on_latency_and_recovers():
+    limiter = AdaptiveLimiter(max_limit=40, min_limit=2, tolerance=2.0)
+
+    async def scenario():
+        for latency in [10.0] * 20 + [80.0] * 200:
+            await limiter.acquire()
+            limiter.release(latency, ok=True)
+        backed_off = limiter.limit
+        for _ in range(2000):
+            await limiter.acquire()
+            limiter.release(10.0, ok=True)
+        return backed_off
+
+    backed_off = asyncio.run(scenario())
+
+    assert backed_off < 40 * 0.9 ** 3
+    assert limiter.limit == 40
+
+
+def test_dead_environment_fails_fast_after_breaker_opens():
+    calls = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal calls
+        calls += 1
+        return httpx.Response(503)
+
+    redis = MemoryFlags()
+    environment = EnvironmentOut(id=3, name="down", base_url="http://down.test")
+    cases = [CaseOut(id=i, name=f"case {i}", method="GET", path=f"/items/{i}", assertions={"statusCode": "200"})
+             for i in range(200)]
+
+    async def scenario():
+        async with ClientPool(transport=httpx.MockTransport(handler)) as pool:
+            engine = ExecutionEngine(1, environment, pool, concurrency=4,
+                                     outbound=OutboundControl(redis, concurrency=4))
+            return await engine.run(cases)
+
+    summary = asyncio.run(scenario())
+
+    assert summary.errors + summary.failed == 200
+    assert calls < 40
+    assert "outbound:{3:down.test}:open" in redis.values
+
+
+@pytest.mark.skipif(not REDIS_URL, reason="set REDIS_TEST_URL to a redis:// URL")
+def test_token_bucket_is_shared_across_guards():
+    async def scenario():
+        redis = Redis.from_url(REDIS_URL)
+        await redis.delete("outbound:{9:bucket.test}:bucket")
+        guards = [HostGuard(redis, 9, "bucket.test", rate=50, burst=1, max_concurrency=100) for _ in range(3)]
+
+        async def take(guard):
+            for _ in range(10):
+                await guard._take_token()
+
+        started = time.perf_counter()
+        await asyncio.gather(*(take(g) for g in guards))
+        elapsed = time.perf_counter() - started
+        await redis.aclose()
+        return elapsed
+
+    # 30 tokens at 50/s with a burst of 1: the last one is due after ~0.58s.
+    assert asyncio.run(scenario()) >= 0.5
+
+
+def test_queueing_for_a_slot_is_not_latency_or_timeout():
+    results = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(0.05)
+        return httpx.Response(200)
+
+    async def collect(result):
+        results.append(result)
+
+    environment = EnvironmentOut(id=4, name="serial", base_url="http://serial.test",
+                                 outbound=OutboundPolicy(rate=0, max_concurrency=1))
+    cases = [CaseOut(id=i, name=f"case {i}", method="GET", path="/slow") for i in range(4)]
+
+    async def scenario():
+        async with ClientPool(transport=httpx.MockTransport(handler)) as pool:
+            engine = ExecutionEngine(1, environment, pool, concurrency=4, timeout=0.12, on_result=collect,
+                                     outbound=OutboundControl(MemoryFlags()))
+            return await engine.run(cases)
+
+    summary = asyncio.run(scenario())
+
+    assert summary.passed == 4  # the last one waited ~0.15s for its slot
+    assert all(result.duration_ms < 100 for result in results)
+
+
+def test_unparsable_path_fails_its_case_only():
+    async def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200)
+
+    environment = EnvironmentOut(id=5, name="odd", base_url="http://odd.test")
+    cases = [CaseOut(id=1, name="broken", method="GET", path="http://[::1"),
+             CaseOut(id=2, name="fine", method="GET", path="/ok")]
+
+    async def scenario():
+        async with ClientPool(transport=httpx.MockTransport(handler)) as pool:
+            engine = ExecutionEngine(1, environment, pool, outbound=OutboundControl(MemoryFlags()))
+            return await engine.run(cases)
+
+    summary = asyncio.run(scenario())
+
+    assert (summary.errors, summary.passed) == (1, 1)
+
+
+def test_guards_are_kept_across_runs_until_the_policy_changes():
+    control = OutboundControl(MemoryFlags(), concurrency=8)
+    environment = EnvironmentOut(id=6, name="shared", base_url="http://shared.test")
+
+    guard = control.guard(environment, "/a")
+    assert control.guard(environment, "http://shared.test/b") is guard
+    assert control.guard(environment, "http://other.test/b") is not guard
+
+    environment.outbound = OutboundPolicy(max_concurrency=2)
+    assert control.guard(environment, "/a") is not guard
+    assert control.guard(environment, "/a").limiter.max_limit == 2
@@ -0,0 +1,87 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.v1 import progress_controller
+from app.services.progress_hub import ProgressHub, Subscription, newer, progress_state
+
+
+def event(kind, completed, total=100):
+    return json.dumps({"execution_id": 1, "type": kind, "status": "failed", "total": total,
+                       "completed": completed, "passed": completed, "duration_ms": 0.0})
+
+
+def test_state_keeps_counters_and_run_status_only():
+    state = progress_state(json.loads(event("case", 3)))
+
+    assert state["status"] == "running"
+    assert (state["total"], state["completed"], state["passed"]) == (100, 3, 3)
+    assert "execution_id" not in state and "type" not in state
+    assert progress_state({"type": "finished", "completed": 100}, state)["status"] == "finished"
+
+
+def test_late_snapshot_never_rewinds_live_state():
+    live = {"status": "running", "completed": 40}
+    stale = {"status": "running", "completed": 10}
+    done = {"status": "finished", "completed": 40}
+
+    assert newer(live, stale) is live
+    assert newer(live, done) is done
+    assert newer(None, stale) is stale
+
+
+def test_connections_get_coalesced_frames_at_bounded_rate():
+    frames = {"fast": [], "second": []}
+    hub = ProgressHub(redis=object())
+
+    async def scenario():
+        subscriptions = {}
+        for name in frames:
+            async def send(frame, name=name):
+                frames[name].append(frame)
+            subscriptions[name] = Subscription(send, max_fps=10)
+        hub._watchers[1] = set(subscriptions.values())
+        hub._watchers[2] = {subscriptions["fast"]}
+
+        tasks = [asyncio.create_task(s.run()) for s in subscriptions.values()]
+        for completed in range(1, 1001):
+            hub.dispatch(b"execution:1", event("case", completed))
+            if completed % 100 == 0:
+                hub.dispatch("execution:2", event("case", completed // 100, total=10))
+                await asyncio.sleep(0.02)
+        hub.dispatch("execution:1", event("finished", 1000))
+        hub.dispatch("execution:3", event("case", 1))  # nobody watches
+        await asyncio.sleep(0.25)
+        for task in tasks:
+            task.cancel()
+
+    asyncio.run(scenario())
+
+    for received in frames.values():
+        assert 1 < len(received) <= 5  # ~0.45s at 10 frames/s, 1000+ events
+        assert received[-1]["executions"][1]["status"] == "finished"
+        assert received[-1]["executions"][1]["completed"] == 1000
+    assert frames["second"][-1]["executions"].keys() == {1}
+    assert any(2 in frame["executions"] for frame in frames["fast"])
+    assert 3 not in hub._latest
+
+
+def test_malformed_frames_get_an_error_and_keep_the_socket_open(monkeypatch):
+    async def authenticate(token):
+        return SimpleNamespace(email="tester@example.com")
+
+    monkeypatch.setattr(progress_controller, "_authenticate", authenticate)
+    app = FastAPI()
+    app.include_router(progress_controller.router)
+
+    with TestClient(app).websocket_connect("/v1/ws/executions?token=t") as websocket:
+        websocket.send_text("not json")
+        assert websocket.receive_json()["type"] == "error"
+        websocket.send_bytes(b"\x00\x01")
+        assert websocket.receive_json()["type"] == "error"
+        websocket.send_json({"action": "unsubscribe", "executions": []})
+        websocket.send_json({"action": "bogus"})
+        assert websocket.receive_json()["type"] == "error"
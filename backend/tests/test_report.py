@@ -0,0 +1,169 @@
+import asyncio
+from collections import defaultdict
+from functools import partial
+from types import SimpleNamespace
+
+import httpx
+from redis.exceptions import ConnectionError
+
+from app.models.domain.execution import CaseOut, EnvironmentOut
+from app.services import execution_service, result_sink
+from app.services.execution_engine import CaseResult, ClientPool
+from app.services.execution_service import ExecutionService
+from app.services.report_aggregator import SEP, ResultAggregator, build_summary, read_aggregate
+from app.utils.histogram import bucket_index
+
+
+class MemoryHashes:
+    """The pipelined hash commands the aggregator issues, kept in dicts."""
+
+    def __init__(self):
+        self.hashes = defaultdict(dict)
+        self.down = False
+
+    def pipeline(self, transaction=True):
+        return MemoryPipeline(self)
+
+
+class MemoryPipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.commands = []
+
+    def hincrby(self, key, field, value):
+        self.commands.append(lambda h: h[key].__setitem__(field, h[key].get(field, 0) + value))
+
+    hincrbyfloat = hincrby
+
+    def expire(self, key, seconds):
+        self.commands.append(lambda h: True)
+
+    def hgetall(self, key):
+        self.commands.append(lambda h: dict(h.get(key, {})))
+
+    async def execute(self):
+        if self.redis.down:
+            raise ConnectionError("redis is down")
+        return [command(self.redis.hashes) for command in self.commands]
+
+
+def field(dimension, name, metric):
+    return SEP.join((dimension, name, metric))
+
+
+def test_build_summary_groups_counts_and_latency():
+    counts = {
+        field("all", "", "success"): 3,
+        field("all", "", "failed"): 1,
+        field("all", "", "skipped"): 1,
+        field("all", "", "duration_ms"): 400.0,
+        field("module", "用户模块", "success"): 3,
+        field("module", "用户模块", "duration_ms"): 300.0,
+        field("module", "订单模块", "failed"): 1,
+        field("module", "订单模块", "skipped"): 1,
+        field("module", "订单模块", "duration_ms"): 100.0,
+        field("endpoint", "POST /api/v1/orders", "failed"): 1,
+    }
+    latency = {bucket_index(100_000): 4}
+
+    summary = build_summary(counts, latency)
+
+    assert (summary["total"], summary["passed"], summary["failed"], summary["skipped"]) == (5, 3, 1, 1)
+    assert summary["pass_rate"] == 60.0
+    assert summary["avg_ms"] == 100.0
+    assert summary["modules"]["用户模块"]["pass_rate"] == 100.0
+    assert summary["modules"]["订单模块"]["avg_ms"] == 100.0
+    assert summary["endpoints"]["POST /api/v1/orders"]["failed"] == 1
+    assert summary["latency"]["count"] == 4
+    assert abs(summary["latency"]["p99_ms"] - 100) < 1
+
+
+def make_result(case_id, status, duration_ms):
+    return CaseResult(case_id=case_id, name=f"case {case_id}", module="用户模块", method="GET", url="/ping",
+                      status=status, duration_ms=duration_ms, endpoint="GET /ping")
+
+
+def test_aggregator_flushes_deltas_and_keeps_them_while_redis_is_down():
+    redis = MemoryHashes()
+    aggregator = ResultAggregator(redis, 7, flush_every=2, flush_interval=3600)
+
+    async def scenario():
+        await aggregator.add(make_result(1, "success", 100.0))
+        assert not redis.hashes  # below flush_every
+        redis.down = True
+        await aggregator.add(make_result(2, "failed", 300.0))
+        await aggregator.add(make_result(3, "skipped", 0.0))
+        assert not redis.hashes
+        redis.down = False
+        await aggregator.flush()
+        return await read_aggregate(redis, 7)
+
+    summary = asyncio.run(scenario())
+
+    assert (summary["total"], summary["passed"], summary["failed"], summary["skipped"]) == (3, 1, 1, 1)
+    assert summary["avg_ms"] == 200.0
+    assert summary["endpoints"]["GET /ping"]["total"] == 3
+    assert summary["latency"]["count"] == 2
+    assert asyncio.run(read_aggregate(redis, 8)) is None
+
+
+class Executions:
+    def __init__(self, execution):
+        self.execution = execution
+        self.statuses = []
+
+    async def get(self, execution_id):
+        return self.execution
+
+    async def mark_running(self, execution, total):
+        self.statuses.append("running")
+
+    async def mark_finished(self, execution, status, passed, failed, duration_ms):
+        self.statuses.append(status)
+
+
+class Lookup:
+    def __init__(self, row):
+        self.row = row
+
+    async def get(self, _):
+        return self.row
+
+
+class Reports:
+    def __init__(self):
+        self.saved = {}
+
+    async def save(self, execution_id, summary):
+        self.saved[execution_id] = summary
+
+
+def test_run_finishes_with_a_memory_report_while_redis_is_down(tmp_path, monkeypatch):
+    async def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200 if request.url.path == "/ok" else 500)
+
+    async def insert_rows(summaries, details):
+        pass
+
+    monkeypatch.setattr(result_sink, "insert_rows", insert_rows)
+    monkeypatch.setattr(result_sink.settings, "RESULT_SPOOL_DIR", str(tmp_path))
+    monkeypatch.setattr(execution_service, "ClientPool", partial(ClientPool, transport=httpx.MockTransport(handler)))
+    monkeypatch.setattr(execution_service, "outbound_control", None)
+
+    execution = SimpleNamespace(id=9, environment_id=1, scope="all", dataset=None, parameters={})
+    cases = [CaseOut(id=i, name=f"case {i}", module="订单模块", method="GET", path="/ok" if i % 2 else "/fail",
+                     assertions={"statusCode": "200"}) for i in range(4)]
+    executions, reports, redis = Executions(execution), Reports(), MemoryHashes()
+    redis.down = True
+    case_repo = SimpleNamespace(list_all=partial(asyncio.sleep, 0, cases))
+    service = ExecutionService(executions, case_repo, Lookup(EnvironmentOut(id=1, name="t", base_url="http://t.test")),
+                               reports, None, redis)
+
+    summary = asyncio.run(service.run(9))
+
+    assert executions.statuses == ["running", "finished"]
+    assert (summary.passed, summary.failed) == (2, 2)
+    report = reports.saved[9]
+    assert (report["total"], report["passed"], report["failed"]) == (4, 2, 2)
+    assert report["modules"]["订单模块"]["total"] == 4
+    assert report["latency"]["count"] == 4
@@ -0,0 +1,168 @@
+import asyncio
+import os
+import zlib
+
+from sqlalchemy.dialects import mysql
+
+from app.repositories.result_repo import ResultRepository
+from app.services.execution_engine import CaseResult
+from app.services.result_sink import ResultSink, to_rows
+
+
+def make_result(seq, body=b"{}"):
+    return CaseResult(
+        case_id=seq, name=f"case-{seq}", module="m", method="GET", url="http://svc/items",
+        status="success", status_code=200, duration_ms=1.5, response_body=body,
+        endpoint="GET /items", seq=seq,
+    )
+
+
+class Recorder:
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.batches = []
+
+    @property
+    def rows(self):
+        return sorted(s["seq"] for summaries in self.batches for s in summaries)
+
+    async def __call__(self, summaries, details):
+        await asyncio.sleep(self.delay)
+        self.batches.append(summaries)
+
+
+def test_results_are_written_in_batches_and_journal_is_removed(tmp_path):
+    writer = Recorder()
+
+    async def scenario():
+        async with ResultSink(writer, str(tmp_path), batch_size=10, flush_interval=60) as sink:
+            for seq in range(25):
+                await sink.add(7, make_result(seq))
+                await asyncio.sleep(0)
+
+    asyncio.run(scenario())
+
+    assert writer.rows == list(range(25))
+    assert max(len(b) for b in writer.batches) >= 10
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_slow_writer_spills_to_disk_and_is_replayed(tmp_path):
+    writer = Recorder(delay=0.05)
+
+    async def scenario():
+        sink = ResultSink(writer, str(tmp_path), batch_size=5, flush_interval=60, flush_timeout=0.01)
+        await sink.start()
+        for seq in range(5):
+            await sink.add(1, make_result(seq))
+        await sink.flush()
+        assert sink.spilled == 5
+        assert [p.suffix for p in tmp_path.iterdir()] == [".ndjson"]
+
+        sink.flush_timeout = 1.0
+        await sink.close()
+
+    asyncio.run(scenario())
+
+    assert writer.rows == list(range(5))
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_segment_left_by_dead_process_is_recovered(tmp_path):
+    async def crash():
+        sink = ResultSink(Recorder(), str(tmp_path), batch_size=100, flush_interval=60)
+        for seq in range(3):
+            await sink.add(2, make_result(seq))
+        sink._segment.close()
+        return sink._segment_path
+
+    active = asyncio.run(crash())
+    orphan = active.with_name("999999999-" + active.name.split("-", 1)[1])
+    active.rename(orphan)
+    with open(orphan, "ab") as f:
+        f.write(b'{"s": {"seq"')  # torn last line
+
+    writer = Recorder()
+
+    async def restart():
+        async with ResultSink(writer, str(tmp_path)):
+            pass
+
+    asyncio.run(restart())
+
+    assert writer.rows == [0, 1, 2]
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_large_bodies_are_compressed():
+    body = b'{"items": [' + b'{"id": 1},' * 500 + b"]}"
+    summary, detail = to_rows(3, make_result(4, body))
+
+    assert (summary["execution_id"], summary["seq"]) == (3, 4)
+    assert detail["body_compressed"] and len(detail["body"]) < len(body)
+    assert zlib.decompress(detail["body"]) == body
+    assert detail["body_size"] == len(body)
+
+
+def test_rejected_segment_is_quarantined_and_later_segments_replay(tmp_path):
+    class Flaky(Recorder):
+        down = True
+
+        async def __call__(self, summaries, details):
+            if self.down:
+                raise ConnectionRefusedError("mysql is down")
+            if any(s["seq"] == 0 for s in summaries):
+                raise ValueError("Data too long for column 'name'")
+            await super().__call__(summaries, details)
+
+    writer = Flaky()
+
+    async def scenario():
+        sink = ResultSink(writer, str(tmp_path), batch_size=2, flush_interval=60)
+        await sink.start()
+        for seq in range(4):
+            await sink.add(3, make_result(seq))
+            if seq % 2:
+                await sink.flush()
+        assert await sink.replay() == 0  # connection errors are retried later
+        assert sorted(p.suffix for p in tmp_path.iterdir()) == [".ndjson", ".ndjson"]
+
+        writer.down = False
+        await sink.close()
+
+    asyncio.run(scenario())
+
+    assert writer.rows == [2, 3]
+    assert [p.suffix for p in tmp_path.iterdir()] == [".failed"]
+
+
+def test_buffer_is_flushed_by_bytes_before_the_batch_fills(tmp_path):
+    writer = Recorder()
+
+    async def scenario():
+        async with ResultSink(writer, str(tmp_path), batch_size=1000, flush_interval=60,
+                              max_buffer_bytes=64 * 1024) as sink:
+            for seq in range(2):
+                await sink.add(5, make_result(seq, body=os.urandom(32 * 1024)))  # ~44 KiB of journal each
+            await asyncio.sleep(0.1)
+            assert writer.rows == [0, 1]
+
+    asyncio.run(scenario())
+
+
+def test_replayed_rows_are_skipped_without_ignoring_data_errors():
+    class Session:
+        statements = []
+
+        async def execute(self, statement, rows):
+            self.statements.append(str(statement.compile(dialect=mysql.dialect())))
+
+        async def commit(self):
+            pass
+
+    summary, detail = to_rows(1, make_result(0))
+    asyncio.run(ResultRepository(Session()).insert_many([summary], [detail]))
+
+    for statement in Session.statements:
+        assert "IGNORE" not in statement
+        assert statement.endswith("ON DUPLICATE KEY UPDATE seq = " + statement.split()[2] + ".seq")
@@ -0,0 +1,103 @@
+import asyncio
+
+from app.models.domain.execution import CaseOut
+from app.services.execution_engine import CaseResult
+from app.services.scheduler import CaseGraph, DagScheduler
+
+
+def make_case(case_id, path="/x", extracts=(), fail=False):
+    return CaseOut(
+        id=case_id,
+        name="fail" if fail else f"case {case_id}",
+        method="GET",
+        path=path,
+        extractors=[{"variable": v, "expression": f"$.{v}"} for v in extracts],
+    )
+
+
+def run_graph(cases, concurrency=8, delay=0.02):
+    recorded = []
+    in_flight = 0
+    peak = 0
+
+    async def run_case(case, variables):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(delay)
+        in_flight -= 1
+        extracted = {e.variable: f"{e.variable}-value" for e in case.extractors}
+        status = "failed" if case.name == "fail" else "success"
+        return CaseResult(case.id, case.name, "", "GET", case.path, status,
+                          duration_ms=delay * 1000, extracted=extracted,
+                          assertions=[{"variables": dict(variables)}])
+
+    async def record(result):
+        recorded.append(result)
+
+    scheduler = DagScheduler(CaseGraph.build(cases), run_case, record, concurrency, {"host": "h"})
+    stats = asyncio.run(scheduler.run())
+    return stats, {r.case_id: r for r in recorded}, peak
+
+
+def test_graph_binds_nearest_preceding_producer():
+    cases = [
+        make_case(1, extracts=["token"]),
+        make_case(2, path="/a?t={{token}}"),
+        make_case(3, extracts=["token"]),
+        make_case(4, path="/b?t={{token}}&h={{host}}"),
+    ]
+    graph = CaseGraph.build(cases)
+    assert graph.dependencies == [set(), {0}, set(), {2}]
+    assert graph.bindings[3] == {"token": 2}
+
+
+def test_independent_cases_run_in_parallel_and_values_flow():
+    cases = [make_case(1, extracts=["token"])] + [make_case(i, path="/u?t={{token}}") for i in range(2, 12)]
+    stats, results, peak = run_graph(cases)
+
+    assert peak == 8
+    assert all(r.status == "success" for r in results.values())
+    assert results[5].assertions[0]["variables"]["token"] == "token-value"
+    # The critical path is root + one child, however the children queue for slots.
+    assert 35 < stats.critical_path_ms < 45
+    assert stats.serial_ms > stats.critical_path_ms
+
+
+def test_failure_skips_only_downstream_cases():
+    cases = [
+        make_case(1, extracts=["token"], fail=True),
+        make_case(2, path="/a?t={{token}}", extracts=["order"]),
+        make_case(3, path="/b?o={{order}}"),
+        make_case(4, path="/independent"),
+    ]
+    stats, results, _ = run_graph(cases)
+
+    assert results[1].status == "failed"
+    assert results[2].status == "skipped"
+    assert results[3].status == "skipped"
+    assert results[4].status == "success"
+    assert stats.skipped == 2
+
+
+def test_crash_cancels_and_awaits_running_cases():
+    unwound = []
+
+    async def run_case(case, variables):
+        try:
+            await asyncio.sleep(0 if case.id == 1 else 10)
+        finally:
+            unwound.append(case.id)
+        return CaseResult(case.id, case.name, "", "GET", case.path, "success")
+
+    async def record(result):
+        raise RuntimeError("sink down")
+
+    async def scenario():
+        scheduler = DagScheduler(CaseGraph.build([make_case(i) for i in range(1, 4)]), run_case, record, 8, {})
+        try:
+            await scheduler.run()
+        except RuntimeError:
+            return sorted(unwound)
+
+    assert asyncio.run(scenario()) == [1, 2, 3]
@@ -0,0 +1,54 @@
+import asyncio
+import os
+
+import pytest
+
+from app.core.sharding import HashRing, ShardedRedis, hash_tag
+
+SHARD_URLS = [u for u in os.getenv("REDIS_TEST_SHARD_URLS", "").split(",") if u]
+
+
+def test_hash_tag_colocates_keys():
+    assert hash_tag("report:{42}:counts") == b"42"
+    assert hash_tag("plain") == b"plain"
+    assert hash_tag("empty:{}:tag") == b"empty:{}:tag"
+
+    ring = HashRing([f"node{i}" for i in range(4)])
+    assert ring.get_node("report:{42}:counts") == ring.get_node("report:{42}:latency")
+
+
+def test_adding_a_node_moves_only_its_share_of_keys():
+    keys = [f"key:{i}" for i in range(20000)]
+    ring = HashRing([f"node{i}" for i in range(4)])
+    before = {k: ring.get_node(k) for k in keys}
+
+    ring.add_node("node4")
+    moved = [k for k in keys if ring.get_node(k) != before[k]]
+
+    # Every moved key must land on the new node, and roughly 1/5 should move.
+    assert all(ring.get_node(k) == "node4" for k in moved)
+    assert 0.12 < len(moved) / len(keys) < 0.28
+
+    ring.remove_node("node4")
+    assert all(ring.get_node(k) == before[k] for k in keys)
+
+
+@pytest.mark.skipif(len(SHARD_URLS) < 2, reason="set REDIS_TEST_SHARD_URLS to two or more redis:// URLs")
+def test_sharded_client_against_local_redis():
+    async def scenario():
+        client = ShardedRedis.from_urls(SHARD_URLS)
+        try:
+            mapping = {f"shard-test:{i}": str(i) for i in range(200)}
+            await client.mset(mapping)
+            values = await client.mget(list(mapping))
+            assert values == [v.encode() for v in mapping.values()]
+
+            per_node = [await node.exists(*mapping) for node in client.nodes.values()]
+            assert sum(per_node) == len(mapping)
+            assert all(count > 0 for count in per_node)
+
+            assert await client.delete(*mapping) == len(mapping)
+        finally:
+            await client.close()
+
+    asyncio.run(scenario())